@@ -91,6 +91,19 @@ def create_app():
     except Exception:
         app.config["MAX_CONTENT_LENGTH"] = 10 * 1024 * 1024
 
+    # Large file downloads can be handed off to the front-end server:
+    # USE_X_SENDFILE=1 makes send_file emit X-Sendfile (Apache mod_xsendfile,
+    # lighttpd); X_ACCEL_CACHE_PREFIX routes cached zips through nginx's
+    # X-Accel-Redirect (see deployment/nginx_redirect.conf).
+    app.use_x_sendfile = os.environ.get("USE_X_SENDFILE", "0").strip() in {
+        "1",
+        "true",
+        "True",
+    }
+    app.config["X_ACCEL_CACHE_PREFIX"] = os.environ.get(
+        "X_ACCEL_CACHE_PREFIX", ""
+    ).strip()
+
     # In debug mode, auto-reload templates and avoid static caching
     debug_env = os.environ.get("FLASK_DEBUG", "0").strip() not in {
         "0",
@@ -83,6 +83,10 @@ def get_runtime_schema_statements() -> list[str]:
         statements.append(
             "CREATE INDEX ix_pb_files_first_ingested_at ON pb_files (first_ingested_at)"
         )
+    if "ix_pb_files_current_quality" not in indexes:
+        statements.append(
+            "CREATE INDEX ix_pb_files_current_quality ON pb_files (is_current, quality)"
+        )
 
     return statements
 
@@ -113,6 +113,9 @@ class PBFile(Base):
             "is_current",
             mysql_length={"group_key": 191},
         ),
+        # Default search order: current files by quality (ties by file name);
+        # lets the initial page read the top rows instead of sorting all of them
+        Index("ix_pb_files_current_quality", "is_current", "quality"),
     )
 
 
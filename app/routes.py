@@ -1,16 +1,25 @@
+import hashlib
 import io
 import json
 import mimetypes
 import os
 import re
+import secrets
+import shutil
+import stat
+import struct
 import subprocess
 import tempfile
 import threading
+import time
 import uuid
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
 from xml.sax.saxutils import escape as _xml_escape
 
 import sentry_sdk
@@ -19,6 +28,7 @@ from flask import (
     Response,
     abort,
     current_app,
+    g,
     jsonify,
     redirect,
     render_template,
@@ -28,10 +38,6 @@ from flask import (
     url_for,
 )
 from werkzeug.exceptions import RequestEntityTooLarge
-from werkzeug.utils import secure_filename
-
-import numpy as np
-from sklearn.manifold import MDS
 
 try:
     from PIL import Image, ImageDraw, ImageFont
@@ -43,12 +49,16 @@ from .db import get_session
 from .models import CheckerValidationCache, PBFile
 from .routes_admin import _format_preview_tile  # reuse tile formatting
 from .routes_admin import _load_upload_settings  # reuse limits
+from .routes_admin import _tmp_upload_dir  # admin waiting room
 from .services.pb_service import (
     aggregate_categories_cached as _aggregate_categories_cached,
     aggregate_beneficiaries_cached as _aggregate_beneficiaries_cached,
     aggregate_comments_cached as _aggregate_comments_cached,
     aggregate_rules_cached as _aggregate_rules_cached,
     aggregate_statistics_cached as _aggregate_statistics_cached,
+    cache_signature as _cache_signature,
+    current_files_signature as _current_files_signature,
+    count_current_files as _count_current_files,
     get_all_current_file_paths,
     get_filter_availability as _get_filter_availability,
     get_current_file_path,
@@ -59,11 +69,14 @@ from .services.pb_service import (
 )
 from .services.snapshot_service import (
     add_link_to_existing_zip as _add_link_to_existing_zip,
+    create_download_snapshot as _create_download_snapshot,
+    create_download_snapshot_from_ids as _create_download_snapshot_from_ids,
     create_snapshot_context as _create_snapshot_context,
     create_download_with_link as _create_download_with_link,
     normalize_filter_context as _normalize_filter_context,
     serve_snapshot_download as _serve_snapshot_download,
 )
+from .services.export_service import latest_export_zip as _latest_export_zip
 from .services.blog_service import (
     blog_sitemap_entries as _blog_sitemap_entries,
     current_blog_social_image_version as _current_blog_social_image_version,
@@ -74,10 +87,11 @@ from .services.blog_service import (
 from .services.visualization_service import get_or_compute_visualization_data
 from .services.rule_comparison_service import get_or_compute_rule_comparison
 from .utils.file_helpers import is_safe_filename as _is_safe_filename
+from .utils.file_helpers import list_pb_files as _list_pb_files
 from .utils.filename_normalization import normalize_storage_filename
 from .utils.formatting import format_int as _format_int
-from .utils.load_pb_file import parse_pb_lines
 from .utils.pb_utils import parse_comments_from_meta as _parse_comments_from_meta
+from .utils.pb_utils import parse_pb_preview_cached as _parse_pb_preview_cached
 from .utils.pb_utils import parse_pb_to_tile as _parse_pb_to_tile
 from .utils.security import log_security_event as _log_security_event
 from .utils.upload_security import (
@@ -88,6 +102,7 @@ from .utils.upload_security import (
     is_safe_regular_file as _is_safe_regular_file,
     public_waiting_room_base_dir as _public_waiting_room_base_dir,
     public_tmp_dir as _public_tmp_dir,
+    secure_upload_name as _secure_upload_name,
     validate_email_address as _validate_email_address,
 )
 from .utils.validation import (
@@ -100,10 +115,18 @@ from .utils.validation import (
     normalize_issue_groups,
     validate_pb_file,
 )
-
-# Simple in-memory registry for zip jobs; zip files and progress json live on disk
+from .utils.zip_utils import WRITE_BUFFER_BYTES as _ZIP_WRITE_BUFFER_BYTES
+from .utils.zip_utils import iter_zip as _zip_iter
+from .utils.zip_utils import write_files as _zip_write_files
+
+# Simple in-memory registry for zip jobs; zip files and progress json live on disk.
+# Tokens are unique per job and each entry is written by exactly one producer
+# (the request handler or its background worker) and only read afterwards, so
+# single-key dict assignment/lookup is atomic enough and needs no lock.
 _ZIP_JOBS: Dict[str, Dict[str, Any]] = {}
-_ZIP_JOBS_LOCK = threading.Lock()
+
+# Parsed + validated public upload tiles: path -> ((mtime_ns, size), tile)
+_SESSION_TILE_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
 
 
 def _capture_public_submission_sentry(email: str, filenames: List[str]) -> None:
@@ -148,23 +171,77 @@ def _capture_public_submission_sentry(email: str, filenames: List[str]) -> None:
 
 
 
+_ZIP_JOBS_DIR: Optional[Path] = None
+
+
+def _download_stamp() -> str:
+    """UTC ``YYYYmmdd_HHMMSS`` stamp used in download file names."""
+    t = time.gmtime()
+    return (
+        f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}"
+        f"_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+    )
+
+
+def _new_job_token() -> str:
+    # 128 random bits in 22 URL-safe chars (path- and filename-safe)
+    return secrets.token_urlsafe(16)
+
+
 def _zip_jobs_dir() -> Path:
-    # Store transient job artifacts in system temp instead of project cache
+    # Store transient job artifacts in system temp instead of project cache.
+    # Resolved once per process; re-created if something swept it away.
+    global _ZIP_JOBS_DIR
+    d = _ZIP_JOBS_DIR
+    if d is not None and d.is_dir():
+        return d
     d = Path(tempfile.gettempdir()) / "pabulib_zip_jobs"
     d.mkdir(parents=True, exist_ok=True)
+    _ZIP_JOBS_DIR = d
     return d
 
 
+# Minimum interval between per-file progress writes while a zip is building
+_PROGRESS_WRITE_INTERVAL = 0.25
+
+# Latest progress per token for pollers served by this process, as
+# (stored_at monotonic seconds, snapshot); saves them a file read. Every
+# update is also written to the JSON file (per-file updates are throttled by
+# the builder), so pollers routed to other workers see the same progress.
+_PROGRESS_MEM: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+# Finished or failed jobs leave memory after this long (the JSON file still
+# answers); jobs that stop updating are dropped with the job files.
+_PROGRESS_MEM_TTL = 60.0 * 5
+_PROGRESS_MEM_MAX_AGE = 60.0 * 30
+
+
+def _evict_progress_mem() -> None:
+    now = time.monotonic()
+    for token, (stored_at, data) in list(_PROGRESS_MEM.items()):
+        age = now - stored_at
+        finished = data.get("done") or data.get("status") == "error"
+        if age > _PROGRESS_MEM_MAX_AGE or (finished and age > _PROGRESS_MEM_TTL):
+            _PROGRESS_MEM.pop(token, None)
+
+
 def _write_progress(token: str, data: Dict[str, Any]) -> None:
+    _PROGRESS_MEM[token] = (time.monotonic(), dict(data))
+    # Write-then-rename so pollers never observe a half-written JSON document
     try:
-        p = _zip_jobs_dir() / f"{token}.json"
-        with p.open("w", encoding="utf-8") as f:
-            json.dump(data, f)
+        d = _zip_jobs_dir()
+        tmp = d / f"{token}.json.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, d / f"{token}.json")
     except Exception:
         pass
+    if data.get("done") or data.get("status") == "error":
+        _evict_progress_mem()
 
 
 def _read_progress(token: str) -> Optional[Dict[str, Any]]:
+    entry = _PROGRESS_MEM.get(token)
+    if entry is not None:
+        return entry[1]
     p = _zip_jobs_dir() / f"{token}.json"
     if not p.exists():
         return None
@@ -176,21 +253,99 @@ def _read_progress(token: str) -> Optional[Dict[str, Any]]:
 
 
 def _cleanup_old_jobs(max_age_seconds: int = 60 * 30) -> None:
-    # best-effort cleanup of old job artifacts
+    # best-effort cleanup of old job artifacts; scandir entries carry the
+    # file type, so each candidate costs a single stat()
     try:
-        now = datetime.utcnow().timestamp()
-        for fp in _zip_jobs_dir().glob("*"):
-            try:
-                if not fp.exists():
+        now = time.time()
+        with os.scandir(_zip_jobs_dir()) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    if now - entry.stat().st_mtime > max_age_seconds:
+                        os.unlink(entry.path)
+                except Exception:
                     continue
-                age = now - fp.stat().st_mtime
-                if age > max_age_seconds:
-                    if fp.is_file():
-                        fp.unlink(missing_ok=True)
-            except Exception:
-                continue
     except Exception:
         pass
+    _evict_progress_mem()
+
+
+# (mtime_ns, size) as fed to the ETag hash after each arcname
+_ETAG_STAMP = struct.Struct("<qq")
+
+
+def _zip_job_etag(file_pairs: List[Tuple[str, Path]]) -> Optional[str]:
+    """Strong ETag for a zip artifact built from ``file_pairs``.
+
+    Hashes each arcname with its source mtime and size; the same inputs always
+    produce byte-identical archive contents, so clients can revalidate cheaply.
+    """
+    try:
+        h = hashlib.blake2b(digest_size=16)
+        update = h.update
+        for arcname, path in file_pairs:
+            st = os.stat(path)
+            # NUL-terminated name, then the fixed-width stamp: unambiguous
+            # without formatting the numbers as text
+            update(arcname.encode("utf-8"))
+            update(b"\0")
+            update(_ETAG_STAMP.pack(st.st_mtime_ns, st.st_size))
+        return h.hexdigest()
+    except Exception:
+        return None
+
+
+_CACHE_ROOT = Path(__file__).resolve().parent.parent / "cache"
+
+
+def _x_accel_zip_response(file_path: Path, download_name: str) -> Optional[Response]:
+    """Hand a cached zip to nginx via X-Accel-Redirect when configured.
+
+    Only files under the project cache directory are eligible; nginx must map
+    ``X_ACCEL_CACHE_PREFIX`` to that directory with an ``internal`` location.
+    """
+    prefix = current_app.config.get("X_ACCEL_CACHE_PREFIX")
+    if not prefix:
+        return None
+    try:
+        rel = Path(file_path).resolve().relative_to(_CACHE_ROOT)
+    except (OSError, ValueError):
+        return None
+    response = Response(mimetype="application/zip")
+    response.headers["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{quote(rel.as_posix())}"
+    response.headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+    return response
+
+
+def _send_zip_artifact(
+    file_path: Path, download_name: str, etag: Optional[str] = None
+) -> Response:
+    """Serve a finished zip with conditional-request support (304 on re-download).
+
+    Cached exports are offloaded to nginx when X-Accel-Redirect is configured;
+    otherwise ``send_file`` emits X-Sendfile itself if ``use_x_sendfile`` is on.
+    """
+    offloaded = _x_accel_zip_response(file_path, download_name)
+    if offloaded is not None:
+        return offloaded
+    return send_file(
+        file_path,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype="application/zip",
+        conditional=True,
+        etag=etag or True,
+        last_modified=os.path.getmtime(file_path),
+        max_age=0,
+    )
+
+
+# Background zip builds share one bounded pool: a burst of download clicks
+# queues up here instead of spawning a compressing thread per request.
+_ZIP_WORKERS = ThreadPoolExecutor(
+    max_workers=max(2, (os.cpu_count() or 2) // 2), thread_name_prefix="zipjob"
+)
 
 
 def _build_zip_in_background(
@@ -200,12 +355,14 @@ def _build_zip_in_background(
     reuse_file_path: Optional[Path] = None,
     file_ids: Optional[List[int]] = None,
     filter_context: Optional[Dict[str, Any]] = None,
+    compress_type: int = zipfile.ZIP_DEFLATED,
 ) -> None:
     """Create the zip in the background and update progress JSON. If reuse_file_path
     is provided, mark job as done immediately using that existing file."""
     try:
         # Immediate completion when a ready-made zip is available
         if reuse_file_path is not None:
+            etag = _zip_job_etag([(reuse_file_path.name, reuse_file_path)])
             progress = {
                 "token": token,
                 "total": len(file_pairs),
@@ -221,17 +378,18 @@ def _build_zip_in_background(
                 "file_path": str(reuse_file_path),
                 "mime_type": "application/zip",
                 "filter_context": filter_context or {},
+                "etag": etag,
             }
             _write_progress(token, progress)
-            with _ZIP_JOBS_LOCK:
-                _ZIP_JOBS[token] = {
-                    "file_path": str(reuse_file_path),
-                    "download_name": download_name,
-                    "file_ids": file_ids or [],
-                    "artifact_type": "zip",
-                    "mime_type": "application/zip",
-                    "filter_context": filter_context or {},
-                }
+            _ZIP_JOBS[token] = {
+                "file_path": str(reuse_file_path),
+                "download_name": download_name,
+                "file_ids": file_ids or [],
+                "artifact_type": "zip",
+                "mime_type": "application/zip",
+                "filter_context": filter_context or {},
+                "etag": etag,
+            }
             return
 
         out_zip = _zip_jobs_dir() / f"{token}.zip"
@@ -254,36 +412,45 @@ def _build_zip_in_background(
         }
         _write_progress(token, progress)
 
-        with zipfile.ZipFile(out_zip, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for idx, (arcname, path) in enumerate(file_pairs, start=1):
-                try:
-                    progress.update(
-                        {
-                            "status": "zipping",
-                            "current_name": arcname,
-                            "current": idx - 1,
-                            "percent": int(((idx - 1) / total) * 100),
-                        }
-                    )
-                    _write_progress(token, progress)
-                    # Add file
-                    zf.write(path, arcname=arcname)
-                    progress.update(
-                        {
-                            "current": idx,
-                            "percent": int((idx / total) * 100),
-                        }
-                    )
-                    _write_progress(token, progress)
-                except Exception as e:
-                    progress.update(
-                        {
-                            "status": "error",
-                            "error": f"Failed to add {arcname}: {e}",
-                        }
-                    )
-                    _write_progress(token, progress)
+        # Pollers check about once a second, so per-file writes are throttled;
+        # status transitions and errors are always written immediately.
+        last_write = 0.0
+
+        def _on_added(idx: int, arcname: str) -> None:
+            nonlocal last_write
+            progress.update(
+                {
+                    "status": "zipping",
+                    "current_name": arcname,
+                    "current": idx,
+                    "percent": int((idx / total) * 100),
+                }
+            )
+            now = time.monotonic()
+            if now - last_write >= _PROGRESS_WRITE_INTERVAL:
+                _write_progress(token, progress)
+                last_write = now
+
+        def _on_error(arcname: str, e: Exception) -> None:
+            progress.update(
+                {
+                    "status": "error",
+                    "error": f"Failed to add {arcname}: {e}",
+                }
+            )
+            _write_progress(token, progress)
+
+        with open(out_zip, "wb", buffering=_ZIP_WRITE_BUFFER_BYTES) as fh:
+            with zipfile.ZipFile(fh, mode="w", compression=compress_type) as zf:
+                _zip_write_files(
+                    zf,
+                    file_pairs,
+                    on_added=_on_added,
+                    on_error=_on_error,
+                    compress_type=compress_type,
+                )
         # Mark complete
+        etag = _zip_job_etag(file_pairs)
         progress.update(
             {
                 "done": True,
@@ -291,18 +458,19 @@ def _build_zip_in_background(
                 "percent": 100,
                 "artifact_type": "zip",
                 "file_path": str(out_zip),
+                "etag": etag,
             }
         )
         _write_progress(token, progress)
-        with _ZIP_JOBS_LOCK:
-            _ZIP_JOBS[token] = {
-                "file_path": str(out_zip),
-                "download_name": download_name,
-                "file_ids": file_ids or [],
-                "artifact_type": "zip",
-                "mime_type": "application/zip",
-                "filter_context": filter_context or {},
-            }
+        _ZIP_JOBS[token] = {
+            "file_path": str(out_zip),
+            "download_name": download_name,
+            "file_ids": file_ids or [],
+            "artifact_type": "zip",
+            "mime_type": "application/zip",
+            "filter_context": filter_context or {},
+            "etag": etag,
+        }
     except Exception as e:
         progress = {
             "token": token,
@@ -331,6 +499,17 @@ def _wants_permanent_link() -> bool:
     return str(raw_value).strip().lower() not in {"1", "true", "yes", "on"}
 
 
+def _requested_compress_type() -> int:
+    """ZIP member compression for this request; compress=0 stores files as-is.
+
+    Stored archives are larger but skip DEFLATE entirely, which dominates the
+    build time of bulk selections.
+    """
+    if request.values.get("compress") == "0":
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
 def _zip_has_permanent_link(zip_path: Path) -> bool:
     """Check whether a ZIP already contains the embedded permanent-link file."""
     try:
@@ -618,11 +797,29 @@ def _sitemap_entries() -> List[Dict[str, str]]:
     return entries
 
 
+# Rendered home page as (key, html). The initial page only depends on the
+# data and the host (canonical URL); the UTC day is in the key because
+# "new" badges age out. The current-files stamp is read on every request so
+# admin changes made through another worker are picked up at once.
+_HOME_HTML: Optional[Tuple[Tuple[Any, ...], str]] = None
+
+
 @bp.route("/")
 def home():
+    global _HOME_HTML
+    sig = _cache_signature()
+    files_sig = _current_files_signature()
+    key = (sig, files_sig, request.base_url, datetime.utcnow().date())
+    cacheable = sig[1] is not None and files_sig is not None
+    cached = _HOME_HTML
+    if cacheable and cached is not None and cached[0] == key:
+        return cached[1]
     # Initial load: get first 20 tiles
     tiles, total = _search_tiles(limit=20)
-    return render_template("index.html", tiles=tiles, count=total)
+    html = render_template("index.html", tiles=tiles, count=total)
+    if cacheable:
+        _HOME_HTML = (key, html)
+    return html
 
 
 @bp.route("/robots.txt")
@@ -830,10 +1027,22 @@ def api_options():
     return jsonify(options)
 
 
+# Encoded /api/tiles body, paired with the cached tiles list it encodes
+_TILES_JSON: Optional[Tuple[List[Dict[str, Any]], str]] = None
+
+
 @bp.route("/api/tiles")
 def api_tiles():
+    global _TILES_JSON
     tiles = _get_tiles_cached()
-    return jsonify(tiles)
+    # get_tiles_cached returns the same list object until it rebuilds, so
+    # the encoded body is reused instead of re-serializing every tile
+    cached = _TILES_JSON
+    if cached is None or cached[0] is not tiles:
+        body = current_app.json.dumps(tiles, separators=(",", ":"))
+        cached = (tiles, f"{body}\n")
+        _TILES_JSON = cached
+    return current_app.response_class(cached[1], mimetype=current_app.json.mimetype)
 
 
 @bp.route("/format")
@@ -1012,7 +1221,14 @@ def check_page():
 
 
 def _public_session_dir() -> Path:
-    """Stable temp dir per user session for public uploads."""
+    """Stable temp dir per user session for public uploads.
+
+    Resolved once per request and memoized on ``flask.g`` so repeated calls
+    skip the stale-dir sweep and ``mkdir`` syscalls.
+    """
+    cached = getattr(g, "_public_session_dir", None)
+    if cached is not None:
+        return cached
     key = session.get("public_tmp_key")
     if not key:
         key = uuid.uuid4().hex
@@ -1028,90 +1244,169 @@ def _public_session_dir() -> Path:
         p.mkdir(mode=0o700, parents=True, exist_ok=True)
     except Exception:
         p.mkdir(parents=True, exist_ok=True)
+    g._public_session_dir = p
     return p
 
 
-def _list_public_tmp_tiles() -> list[dict]:
-    """Build rich tiles for the public upload session, mirroring admin preview."""
-    tmp_dir = _public_session_dir()
-    tiles: list[dict] = []
-    for p in sorted(tmp_dir.glob("*.pb")):
-        if not _is_safe_regular_file(p, tmp_dir):
-            continue
-        try:
-            # Parse PB to a tile dict and format to preview shape like admin
-            parsed = _parse_pb_to_tile(p)
-            tile_data = _format_preview_tile(parsed)
-            tile_data["file_name"] = p.name  # ensure filename is the session one
-            # Determine if this would overwrite an existing current dataset (by webpage_name)
-            try:
-                webpage_name = (tile_data.get("webpage_name") or "").strip()
-                exists_conflict = False
-                if webpage_name:
-                    with get_session() as s:
-                        exists_conflict = (
-                            s.query(PBFile.id)
-                            .filter(
-                                PBFile.webpage_name == webpage_name,
-                                PBFile.is_current == True,  # noqa: E712
-                            )
-                            .first()
-                            is not None
-                        )
-                tile_data["exists_conflict"] = bool(exists_conflict)
-            except Exception:
-                tile_data["exists_conflict"] = False
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """Place ``src`` at ``dest`` without pulling the file through Python.
+
+    Hard-links when both paths share a filesystem; otherwise falls back to
+    ``shutil.copyfile``, which uses the kernel copy fast path where available.
+    """
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+def _build_public_tile(p: Path, tmp_dir: Path) -> Optional[dict]:
+    """Parse, format and validate a single session PB file into a preview tile.
 
-            # Cached validation (reuse and cache to avoid re-validating constantly)
-            validation_cache_path = tmp_dir / f".{p.name}.validation.json"
+    Runs off the request thread (see ``_list_public_tmp_tiles``), so it must not
+    touch the Flask request context or a shared DB session.
+    """
+    if not _is_safe_regular_file(p, tmp_dir):
+        return None
+    try:
+        # Parse PB to a tile dict and format to preview shape like admin
+        parsed = _parse_pb_to_tile(p)
+        tile_data = _format_preview_tile(parsed)
+        tile_data["file_name"] = p.name  # ensure filename is the session one
+
+        # Cached validation (reuse and cache to avoid re-validating constantly)
+        validation_cache_path = tmp_dir / f".{p.name}.validation.json"
+        validation = None
+        try:
+            if (
+                validation_cache_path.exists()
+                and validation_cache_path.stat().st_mtime >= p.stat().st_mtime
+            ):
+                with open(validation_cache_path, "r") as f:
+                    validation = json.load(f)
+        except Exception:
             validation = None
+        if validation is None:
+            validation = validate_pb_file(p)
             try:
-                if (
-                    validation_cache_path.exists()
-                    and validation_cache_path.stat().st_mtime >= p.stat().st_mtime
-                ):
-                    with open(validation_cache_path, "r") as f:
-                        validation = json.load(f)
+                with open(validation_cache_path, "w") as f:
+                    json.dump(validation, f)
             except Exception:
-                validation = None
-            if validation is None:
-                validation = validate_pb_file(p)
-                try:
-                    with open(validation_cache_path, "w") as f:
-                        json.dump(validation, f)
-                except Exception:
-                    pass
+                pass
 
-            tile_data["validation"] = validation
-            tile_data["validation_summary"] = format_validation_summary(validation)
-            issue_counts = count_issues(validation)
-            tile_data["error_count"] = issue_counts.get("errors", 0)
-            tile_data["warning_count"] = issue_counts.get("warnings", 0)
+        tile_data["validation"] = validation
+        tile_data["validation_summary"] = format_validation_summary(validation)
+        issue_counts = count_issues(validation)
+        tile_data["error_count"] = issue_counts.get("errors", 0)
+        tile_data["warning_count"] = issue_counts.get("warnings", 0)
+        return tile_data
+    except Exception as e:
+        # Provide a minimal error tile with a visible validation error
+        return {
+            "file_name": p.name,
+            "title": p.stem.replace("_", " "),
+            "description": "(Failed to parse)",
+            "num_votes": "—",
+            "num_projects": "—",
+            "budget": "—",
+            "vote_type": "",
+            "vote_length": "—",
+            "validation": {
+                "valid": False,
+                "errors": None,
+                "warnings": None,
+                "error_message": f"Parse error: {e.__class__.__name__}: {str(e)}. File likely corrupted or malformed.",
+            },
+            "validation_summary": f"⚠ Parse error: {e.__class__.__name__}: {str(e)}. File likely corrupted.",
+            "error_count": 0,
+            "warning_count": 0,
+        }
 
-            tiles.append(tile_data)
-        except Exception as e:
-            # Provide a minimal error tile with a visible validation error
-            tiles.append(
-                {
-                    "file_name": p.name,
-                    "title": p.stem.replace("_", " "),
-                    "description": "(Failed to parse)",
-                    "num_votes": "—",
-                    "num_projects": "—",
-                    "budget": "—",
-                    "vote_type": "",
-                    "vote_length": "—",
-                    "validation": {
-                        "valid": False,
-                        "errors": None,
-                        "warnings": None,
-                        "error_message": f"Parse error: {e.__class__.__name__}: {str(e)}. File likely corrupted or malformed.",
-                    },
-                    "validation_summary": f"⚠ Parse error: {e.__class__.__name__}: {str(e)}. File likely corrupted.",
-                    "error_count": 0,
-                    "warning_count": 0,
+
+def _mark_public_tile_conflicts(tiles: list[dict]) -> None:
+    """Flag tiles that would overwrite a current dataset (by webpage_name).
+
+    Uses a single batched IN query instead of one lookup per tile.
+    """
+    parsed_tiles = [t for t in tiles if "webpage_name" in t]
+    names = {
+        (t.get("webpage_name") or "").strip() for t in parsed_tiles
+    } - {""}
+    existing: set = set()
+    if names:
+        try:
+            with get_session() as s:
+                existing = {
+                    name
+                    for (name,) in s.query(PBFile.webpage_name)
+                    .filter(
+                        PBFile.webpage_name.in_(names),
+                        PBFile.is_current == True,  # noqa: E712
+                    )
+                    .all()
                 }
-            )
+        except Exception:
+            existing = set()
+    for t in parsed_tiles:
+        t["exists_conflict"] = (t.get("webpage_name") or "").strip() in existing
+
+
+def _purge_session_tile_cache(tmp_dir: Path, live_paths: set) -> None:
+    """Drop cached tiles for deleted files and for expired session dirs."""
+    prefix = str(tmp_dir) + os.sep
+    dir_alive: Dict[str, bool] = {}
+    for key in list(_SESSION_TILE_CACHE):
+        if key.startswith(prefix):
+            if key not in live_paths:
+                _SESSION_TILE_CACHE.pop(key, None)
+            continue
+        parent = os.path.dirname(key)
+        alive = dir_alive.get(parent)
+        if alive is None:
+            alive = dir_alive[parent] = os.path.isdir(parent)
+        if not alive:
+            _SESSION_TILE_CACHE.pop(key, None)
+
+
+def _list_public_tmp_tiles() -> list[dict]:
+    """Build rich tiles for the public upload session, mirroring admin preview.
+
+    Tiles are cached per file keyed by (mtime_ns, size), so a render only
+    parses and validates files that changed since the last one. Those are
+    processed in parallel; validation is dominated by file I/O and the
+    checker, so threads give a near-linear speedup on a session's first load.
+    """
+    tmp_dir = _public_session_dir()
+    paths = _list_pb_files(tmp_dir)
+    _purge_session_tile_cache(tmp_dir, {str(p) for p in paths})
+    if not paths:
+        return []
+
+    built: Dict[Path, Optional[dict]] = {}
+    stale: List[Tuple[Path, Tuple[int, int]]] = []
+    for p in paths:
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _SESSION_TILE_CACHE.get(str(p))
+        if cached is not None and cached[0] == stamp:
+            built[p] = cached[1]
+        else:
+            stale.append((p, stamp))
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=min(8, len(stale))) as ex:
+            fresh = list(ex.map(lambda item: _build_public_tile(item[0], tmp_dir), stale))
+        for (p, stamp), tile in zip(stale, fresh):
+            built[p] = tile
+            if tile is not None:
+                _SESSION_TILE_CACHE[str(p)] = (stamp, tile)
+
+    # Shallow-copy so per-render fields (exists_conflict) never leak into the cache
+    tiles: list[dict] = [dict(built[p]) for p in paths if built.get(p) is not None]
+    _mark_public_tile_conflicts(tiles)
     return tiles
 
 
@@ -1151,7 +1446,9 @@ def upload_upload_batch():
         "true",
         "yes",
     }
-    existing = {p.name for p in tmp_dir.glob("*.pb") if _is_safe_regular_file(p, tmp_dir)}
+    existing = {
+        p.name for p in _list_pb_files(tmp_dir) if _is_safe_regular_file(p, tmp_dir)
+    }
 
     results = []
     saved = 0
@@ -1343,14 +1640,11 @@ def upload_submit_selected():
         )
 
     tmp_dir = _public_session_dir()
-
-    from .routes_admin import _tmp_upload_dir  # local import to avoid cycles
-
     admin_tmp = _tmp_upload_dir()
     saved = 0
     results = []
     for name in files:
-        safe = secure_filename(str(name))
+        safe = _secure_upload_name(str(name))
         src = tmp_dir / safe
         if not safe or not _is_allowed_ext(safe) or not _is_safe_regular_file(src, tmp_dir):
             results.append({"ok": False, "name": name, "msg": "Not found"})
@@ -1406,8 +1700,7 @@ def upload_submit_selected():
                     break
                 i += 1
         try:
-            # Copy bytes
-            dest.write_bytes(src.read_bytes())
+            _link_or_copy(src, dest)
             admin_validation_cache_path = admin_tmp / f".{dest.name}.validation.json"
             try:
                 admin_validation_cache_path.write_text(
@@ -1473,7 +1766,7 @@ def upload_delete_selected():
     deleted = 0
     results = []
     for name in files:
-        safe = secure_filename(str(name))
+        safe = _secure_upload_name(str(name))
         if not safe or not _is_allowed_ext(safe):
             results.append({"ok": False, "name": name, "msg": "Invalid name"})
             continue
@@ -1631,8 +1924,6 @@ def upload_submit():
             )
 
         # Copy into admin tmp with a sidecar marker containing email
-        from .routes_admin import _tmp_upload_dir  # avoid cycle at top
-
         admin_tmp = _tmp_upload_dir()
         dest = admin_tmp / safe_name
         if dest.exists() and dest.is_symlink():
@@ -1649,8 +1940,7 @@ def upload_submit():
                     break
                 i += 1
         # Write file
-        content = tmp_path.read_bytes()
-        dest.write_bytes(content)
+        _link_or_copy(tmp_path, dest)
         try:
             (admin_tmp / f".{dest.name}.validation.json").write_text(
                 json.dumps(validation), encoding="utf-8"
@@ -1780,9 +2070,15 @@ def details_page():
     )
 
 
-@bp.route("/statistics")
-def statistics_page():
-    totals, series = _aggregate_statistics_cached()
+# Formatted totals and budget list, paired with the cached totals they show
+_STATS_DISPLAY: Optional[
+    Tuple[Dict[str, Any], Dict[str, str], List[Dict[str, str]]]
+] = None
+
+
+def _format_statistics_totals(
+    totals: Dict[str, Any],
+) -> Tuple[Dict[str, str], List[Dict[str, str]]]:
     # Provide some pre-formatted numbers for display
     formatted = {
         "files": _format_int(totals.get("total_files", 0)),
@@ -1800,6 +2096,20 @@ def statistics_page():
             budgets_map.items(), key=lambda kv: (kv[0] == "—", kv[0])
         )
     ]
+    return formatted, budgets_list
+
+
+@bp.route("/statistics")
+def statistics_page():
+    global _STATS_DISPLAY
+    totals, series = _aggregate_statistics_cached()
+    # The aggregate returns the same totals dict until it rebuilds, so the
+    # display strings are derived once per rebuild rather than per request
+    cached = _STATS_DISPLAY
+    if cached is None or cached[0] is not totals:
+        cached = (totals, *_format_statistics_totals(totals))
+        _STATS_DISPLAY = cached
+    _totals, formatted, budgets_list = cached
     return render_template(
         "statistics.html",
         totals=totals,
@@ -1813,10 +2123,146 @@ def statistics_page():
 def download(filename: str):
     # DB-only: resolve path from DB
     path = get_current_file_path(filename)
-    if not path or not path.exists() or not path.is_file():
+    try:
+        st = path.stat() if path else None
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         abort(404)
     # Serve single files directly without creating a snapshot or exposing headers.
-    return send_file(path, as_attachment=True)
+    # Repeat fetches of an unchanged file get a 304 via the ETag/Last-Modified.
+    return send_file(
+        path,
+        as_attachment=True,
+        conditional=True,
+        etag=f"{st.st_mtime_ns:x}-{st.st_size:x}",
+        last_modified=st.st_mtime,
+    )
+
+
+def _serve_all_zip(use_permanent_link: bool, filter_context: Dict[str, Any]):
+    """Serve every current file as one zip, preferring the newest prebuilt export."""
+    # 1) Prefer the newest timestamped export zip: cache/<ts>/all_pb_files.zip
+    latest_export: Optional[Path] = _latest_export_zip()
+    if latest_export is not None:
+        # Prefer serving the prebuilt ZIP directly; only consult DB if we must inject a link
+        base_url = request.host_url.rstrip("/")
+        ts_download = _download_stamp()
+        dl_name = f"all_pb_files_{ts_download}.zip"
+        if not use_permanent_link:
+            if not _zip_has_permanent_link(latest_export):
+                return _send_zip_artifact(latest_export, dl_name)
+        else:
+            try:
+                with zipfile.ZipFile(latest_export, "r") as zf:
+                    if "_PERMANENT_DOWNLOAD_LINK.txt" in zf.namelist():
+                        try:
+                            txt = zf.read("_PERMANENT_DOWNLOAD_LINK.txt").decode(
+                                "utf-8", "ignore"
+                            )
+                        except Exception:
+                            txt = ""
+                        m = re.search(r"/download/snapshot/([0-9a-f]{16})", txt)
+                        snapshot_id = m.group(1) if m else None
+                        c = re.search(r"[?&]context=([0-9a-f]{16})", txt)
+                        context_id = c.group(1) if c else None
+                        resp = _send_zip_artifact(latest_export, dl_name)
+                        if snapshot_id:
+                            resp.headers["X-Download-Snapshot-ID"] = snapshot_id
+                            resp.headers["X-Download-Snapshot-URL"] = _snapshot_external_url(
+                                snapshot_id, context_id
+                            )
+                        return resp
+            except Exception:
+                pass
+
+        # If the prebuilt doesn't have a link (legacy zip), we need the current set
+        all_file_pairs = get_all_current_file_paths()
+        if not all_file_pairs:
+            abort(404, description="No current files found")
+        if use_permanent_link:
+            try:
+                snapshot_id = _create_download_snapshot(
+                    file_pairs=all_file_pairs, download_name=dl_name
+                )
+                context_id = _create_snapshot_context(
+                    snapshot_id=snapshot_id,
+                    download_name=dl_name,
+                    filters=filter_context,
+                )
+                mem = _add_link_to_existing_zip(
+                    latest_export,
+                    snapshot_id,
+                    dl_name,
+                    base_url,
+                    filters=filter_context,
+                    context_id=context_id,
+                )
+                response = send_file(
+                    mem,
+                    as_attachment=True,
+                    download_name=dl_name,
+                    mimetype="application/zip",
+                )
+                response.headers["X-Download-Snapshot-ID"] = snapshot_id
+                response.headers["X-Download-Snapshot-URL"] = _snapshot_external_url(
+                    snapshot_id, context_id
+                )
+                return response
+            except Exception:
+                return _send_zip_artifact(latest_export, dl_name)
+
+    # 2) No timestamped export found; build a fresh timestamped export now
+    all_file_pairs = get_all_current_file_paths()
+    if not all_file_pairs:
+        abort(404, description="No current files found")
+    ts = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    out_dir = _CACHE_ROOT / ts
+    try:
+        # Also creates the cache root on first use
+        out_dir.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        pass
+    out_zip = out_dir / "all_pb_files.zip"
+    with open(out_zip, "wb", buffering=_ZIP_WRITE_BUFFER_BYTES) as fh:
+        with zipfile.ZipFile(fh, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+            _zip_write_files(zf, all_file_pairs)
+    ts_download = _download_stamp()
+    dl_name = f"all_pb_files_{ts_download}.zip"
+    if not use_permanent_link:
+        return _send_zip_artifact(out_zip, dl_name)
+    # Add link file to streamed response (cached zip on disk remains unchanged)
+    try:
+        base_url = request.host_url.rstrip("/")
+        snapshot_id = _create_download_snapshot(
+            file_pairs=all_file_pairs, download_name=dl_name
+        )
+        context_id = _create_snapshot_context(
+            snapshot_id=snapshot_id,
+            download_name=dl_name,
+            filters=filter_context,
+        )
+        mem = _add_link_to_existing_zip(
+            out_zip,
+            snapshot_id,
+            dl_name,
+            base_url,
+            filters=filter_context,
+            context_id=context_id,
+        )
+        response = send_file(
+            mem,
+            as_attachment=True,
+            download_name=dl_name,
+            mimetype="application/zip",
+        )
+        response.headers["X-Download-Snapshot-ID"] = snapshot_id
+        response.headers["X-Download-Snapshot-URL"] = _snapshot_external_url(
+            snapshot_id, context_id
+        )
+        return response
+    except Exception:
+        return _send_zip_artifact(out_zip, dl_name)
 
 
 @bp.post("/download-selected")
@@ -1833,173 +2279,11 @@ def download_selected():
         request.args.get("select_all") == "true"
     )
 
-    # If select_all=true but no explicit names posted, treat as all current
-    if not names and select_all:
-        names = []  # explicit empty list signals select-all branch below
-
-    # Get total count of current files to compare with selected count
-    with get_session() as s:
-        total_current_files = s.query(PBFile).filter(PBFile.is_current == True).count()
-
-    # Check if user selected ALL current files
-    # Consider select_all=true with no names as "all" as well (JS may omit names)
-    selected_all_current = select_all and (
-        len(names) == total_current_files or len(names) == 0
-    )
-
-    if selected_all_current:
-        # User selected ALL current files - prefer newest timestamped export zip
-        cache_dir = Path(__file__).parent.parent / "cache"
-        cache_dir.mkdir(exist_ok=True)  # Ensure cache directory exists
-
-        # 1) Prefer the newest timestamped export zip: cache/<ts>/all_pb_files.zip
-        latest_export: Optional[Path] = None
-        try:
-            for p in cache_dir.rglob("all_pb_files.zip"):
-                # Only consider files under a subdirectory (timestamped)
-                if p.parent == cache_dir:
-                    continue
-                if not p.is_file():
-                    continue
-                if (
-                    latest_export is None
-                    or p.stat().st_mtime > latest_export.stat().st_mtime
-                ):
-                    latest_export = p
-        except Exception:
-            latest_export = None
-        if latest_export is not None:
-            # Prefer serving the prebuilt ZIP directly; only consult DB if we must inject a link
-            base_url = request.host_url.rstrip("/")
-            ts_download = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            dl_name = f"all_pb_files_{ts_download}.zip"
-            if not use_permanent_link:
-                if not _zip_has_permanent_link(latest_export):
-                    return send_file(
-                        latest_export, as_attachment=True, download_name=dl_name
-                    )
-            else:
-                try:
-                    import re
-
-                    with zipfile.ZipFile(latest_export, "r") as zf:
-                        if "_PERMANENT_DOWNLOAD_LINK.txt" in zf.namelist():
-                            try:
-                                txt = zf.read("_PERMANENT_DOWNLOAD_LINK.txt").decode(
-                                    "utf-8", "ignore"
-                                )
-                            except Exception:
-                                txt = ""
-                            m = re.search(r"/download/snapshot/([0-9a-f]{16})", txt)
-                            snapshot_id = m.group(1) if m else None
-                            c = re.search(r"[?&]context=([0-9a-f]{16})", txt)
-                            context_id = c.group(1) if c else None
-                            resp = send_file(
-                                latest_export,
-                                as_attachment=True,
-                                download_name=dl_name,
-                            )
-                            if snapshot_id:
-                                resp.headers["X-Download-Snapshot-ID"] = snapshot_id
-                                resp.headers["X-Download-Snapshot-URL"] = _snapshot_external_url(
-                                    snapshot_id, context_id
-                                )
-                            return resp
-                except Exception:
-                    pass
-
-            # If the prebuilt doesn't have a link (legacy zip), we need the current set
-            all_file_pairs = get_all_current_file_paths()
-            if not all_file_pairs:
-                abort(404, description="No current files found")
-            if use_permanent_link:
-                try:
-                    from .services.snapshot_service import create_download_snapshot
-
-                    snapshot_id = create_download_snapshot(
-                        file_pairs=all_file_pairs, download_name=dl_name
-                    )
-                    context_id = _create_snapshot_context(
-                        snapshot_id=snapshot_id,
-                        download_name=dl_name,
-                        filters=filter_context,
-                    )
-                    mem = _add_link_to_existing_zip(
-                        latest_export,
-                        snapshot_id,
-                        dl_name,
-                        base_url,
-                        filters=filter_context,
-                        context_id=context_id,
-                    )
-                    response = send_file(
-                        mem,
-                        as_attachment=True,
-                        download_name=dl_name,
-                        mimetype="application/zip",
-                    )
-                    response.headers["X-Download-Snapshot-ID"] = snapshot_id
-                    response.headers["X-Download-Snapshot-URL"] = _snapshot_external_url(
-                        snapshot_id, context_id
-                    )
-                    return response
-                except Exception:
-                    return send_file(
-                        latest_export, as_attachment=True, download_name=dl_name
-                    )
-
-        # 2) No timestamped export found; build a fresh timestamped export now
-        all_file_pairs = get_all_current_file_paths()
-        if not all_file_pairs:
-            abort(404, description="No current files found")
-        ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-        out_dir = cache_dir / ts
-        try:
-            out_dir.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            pass
-        out_zip = out_dir / "all_pb_files.zip"
-        with zipfile.ZipFile(out_zip, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for file_name, file_path in all_file_pairs:
-                zf.write(file_path, arcname=file_name)
-        ts_download = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        dl_name = f"all_pb_files_{ts_download}.zip"
-        if not use_permanent_link:
-            return send_file(out_zip, as_attachment=True, download_name=dl_name)
-        # Add link file to streamed response (cached zip on disk remains unchanged)
-        try:
-            from .services.snapshot_service import create_download_snapshot
-
-            base_url = request.host_url.rstrip("/")
-            snapshot_id = create_download_snapshot(
-                file_pairs=all_file_pairs, download_name=dl_name
-            )
-            context_id = _create_snapshot_context(
-                snapshot_id=snapshot_id,
-                download_name=dl_name,
-                filters=filter_context,
-            )
-            mem = _add_link_to_existing_zip(
-                out_zip,
-                snapshot_id,
-                dl_name,
-                base_url,
-                filters=filter_context,
-                context_id=context_id,
-            )
-            response = send_file(
-                mem,
-                as_attachment=True,
-                download_name=dl_name,
-                mimetype="application/zip",
-            )
-            response.headers["X-Download-Snapshot-ID"] = snapshot_id
-            response.headers["X-Download-Snapshot-URL"] = _snapshot_external_url(
-                snapshot_id, context_id
-            )
-            return response
-        except Exception:
-            return send_file(out_zip, as_attachment=True, download_name=dl_name)
+    # User selected ALL current files: the DB list is authoritative, so skip
+    # per-name validation and lookups. select_all with no names counts as "all"
+    # too (JS may omit names); otherwise the count is only a sanity check.
+    if select_all and (not names or len(names) == _count_current_files()):
+        return _serve_all_zip(use_permanent_link, filter_context)
 
     # Original logic for individual file selection
     files = []
@@ -2019,29 +2303,29 @@ def download_selected():
 
     # Build multi-file download with embedded permanent link
     file_pairs = [(p.name, p) for p in files]
-    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    stamp = _download_stamp()
     filename = f"pb_selected_{len(files)}_{stamp}.zip"
+    compress_type = _requested_compress_type()
     if not use_permanent_link:
-        memory_file = io.BytesIO()
-        with zipfile.ZipFile(memory_file, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for arcname, path in file_pairs:
-                zf.write(path, arcname=arcname)
-        memory_file.seek(0)
-        return send_file(
-            memory_file,
-            as_attachment=True,
-            download_name=filename,
+        # Stream members as they are compressed; memory stays flat and the
+        # client starts receiving after the first file
+        return Response(
+            _zip_iter(file_pairs, compress_type=compress_type),
             mimetype="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
     base_url = request.host_url.rstrip("/")
-    mem, _snapshot_id, _context_id = _create_download_with_link(
+    chunks, _snapshot_id, _context_id = _create_download_with_link(
         file_pairs=file_pairs,
         download_name=filename,
         base_url=base_url,
         filters=filter_context,
+        compress_type=compress_type,
     )
-    response = send_file(
-        mem, as_attachment=True, download_name=filename, mimetype="application/zip"
+    response = Response(
+        chunks,
+        mimetype="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
     try:
         response.headers["X-Download-Snapshot-ID"] = _snapshot_id
@@ -2103,8 +2387,7 @@ def download_selected_start():
         return jsonify({"ok": False, "error": "No files selected"}), 400
 
     # Total current files to verify select_all scenario
-    with get_session() as s:
-        total_current_files = s.query(PBFile).filter(PBFile.is_current == True).count()
+    total_current_files = _count_current_files()
 
     # Consider it a true "all current" request when select_all is set with no excludes
     # and either all names were provided or names list is empty (client opted not to send large body).
@@ -2122,23 +2405,8 @@ def download_selected_start():
 
     if selected_all_current:
         # Prefer the newest timestamped export zip under cache/<ts>/all_pb_files.zip
-        cache_dir = Path(__file__).parent.parent / "cache"
-        cache_dir.mkdir(exist_ok=True)
         # 1) Try newest timestamped export first
-        latest_export: Optional[Path] = None
-        try:
-            for p in cache_dir.rglob("all_pb_files.zip"):
-                if p.parent == cache_dir:
-                    continue  # skip canonical root file
-                if not p.is_file():
-                    continue
-                if (
-                    latest_export is None
-                    or p.stat().st_mtime > latest_export.stat().st_mtime
-                ):
-                    latest_export = p
-        except Exception:
-            latest_export = None
+        latest_export: Optional[Path] = _latest_export_zip()
         if latest_export is not None:
             if use_permanent_link or not _zip_has_permanent_link(latest_export):
                 reuse_path = latest_export
@@ -2150,7 +2418,7 @@ def download_selected_start():
             file_pairs = [(name, path) for name, path in all_file_pairs]
         # Use current timestamp in the suggested download name for the 'all' download
         download_name = (
-            f"all_pb_files_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+            f"all_pb_files_{_download_stamp()}.zip"
         )
     elif select_all and has_filters:
         # Filtered select all
@@ -2194,7 +2462,7 @@ def download_selected_start():
         except Exception:
             file_ids_for_snapshot = []
             
-        stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        stamp = _download_stamp()
         download_name = f"pb_selected_{len(file_pairs)}_{stamp}.zip"
     else:
         # Either: exclude-mode (select all minus excludes) OR explicit list of names
@@ -2233,7 +2501,7 @@ def download_selected_start():
             # If only one file will be downloaded, do not create a snapshot link
             if len(file_pairs) == 1:
                 file_ids_for_snapshot = []
-            stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            stamp = _download_stamp()
             download_name = f"pb_selected_{len(file_pairs)}_{stamp}.zip"
         else:
             # Individual file selection from provided names
@@ -2266,7 +2534,7 @@ def download_selected_start():
             # If only one file will be downloaded, do not create a snapshot link
             if len(file_pairs) == 1:
                 file_ids_for_snapshot = []
-        stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        stamp = _download_stamp()
         download_name = f"pb_selected_{len(file_pairs)}_{stamp}.zip"
 
     if not use_permanent_link:
@@ -2276,7 +2544,7 @@ def download_selected_start():
         arcname, path = file_pairs[0]
         download_name = arcname
         mime_type = mimetypes.guess_type(download_name)[0] or "application/octet-stream"
-        token = uuid.uuid4().hex
+        token = _new_job_token()
         progress_payload = {
             "token": token,
             "total": 1,
@@ -2294,14 +2562,13 @@ def download_selected_start():
             "filter_context": filter_context,
         }
         _write_progress(token, progress_payload)
-        with _ZIP_JOBS_LOCK:
-            _ZIP_JOBS[token] = {
-                "file_path": str(path),
-                "download_name": download_name,
-                "artifact_type": "file",
-                "mime_type": mime_type,
-                "filter_context": filter_context,
-            }
+        _ZIP_JOBS[token] = {
+            "file_path": str(path),
+            "download_name": download_name,
+            "artifact_type": "file",
+            "mime_type": mime_type,
+            "filter_context": filter_context,
+        }
         response = jsonify(
             {
                 "ok": True,
@@ -2313,7 +2580,7 @@ def download_selected_start():
         response.headers["X-Download-Reuse-Cache"] = "false"
         return response
 
-    token = uuid.uuid4().hex
+    token = _new_job_token()
     # Record initial state
     _write_progress(
         token,
@@ -2334,20 +2601,17 @@ def download_selected_start():
         },
     )
 
-    # Start background worker
-    t = threading.Thread(
-        target=_build_zip_in_background,
-        args=(
-            token,
-            file_pairs,
-            download_name,
-            reuse_path,
-            file_ids_for_snapshot,
-            filter_context,
-        ),
-        daemon=True,
+    # Queue background worker
+    _ZIP_WORKERS.submit(
+        _build_zip_in_background,
+        token,
+        file_pairs,
+        download_name,
+        reuse_path,
+        file_ids_for_snapshot,
+        filter_context,
+        _requested_compress_type(),
     )
-    t.start()
 
     response = jsonify(
         {
@@ -2384,39 +2648,20 @@ def handle_large_request(e):
             _cleanup_old_jobs()
             # Determine total current file count for progress without scanning filesystem
             try:
-                with get_session() as s:
-                    total_current_files = (
-                        s.query(PBFile)
-                        .filter(PBFile.is_current == True)
-                        .count()  # noqa: E712
-                    )
+                total_current_files = _count_current_files()
             except Exception:
                 total_current_files = 0
             if total_current_files == 0:
                 return jsonify({"ok": False, "error": "No current files found"}), 404
             # Use or refresh cache
-            cache_dir = Path(__file__).parent.parent / "cache"
-            cache_dir.mkdir(exist_ok=True)
             # First, prefer newest timestamped export
-            latest_export: Optional[Path] = None
-            try:
-                for p in cache_dir.rglob("all_pb_files.zip"):
-                    if p.parent == cache_dir:
-                        continue
-                    if not p.is_file():
-                        continue
-                    if (
-                        latest_export is None
-                        or p.stat().st_mtime > latest_export.stat().st_mtime
-                    ):
-                        latest_export = p
-            except Exception:
-                latest_export = None
-            token = uuid.uuid4().hex
+            latest_export: Optional[Path] = _latest_export_zip()
+            token = _new_job_token()
             download_name = (
-                f"all_pb_files_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+                f"all_pb_files_{_download_stamp()}.zip"
             )
             if latest_export is not None:
+                etag = _zip_job_etag([(latest_export.name, latest_export)])
                 _write_progress(
                     token,
                     {
@@ -2433,16 +2678,17 @@ def handle_large_request(e):
                         "mime_type": "application/zip",
                         "file_path": str(latest_export),
                         "file_ids": [],
+                        "etag": etag,
                     },
                 )
-                with _ZIP_JOBS_LOCK:
-                    _ZIP_JOBS[token] = {
-                        "file_path": str(latest_export),
-                        "download_name": download_name,
-                        "artifact_type": "zip",
-                        "mime_type": "application/zip",
-                        "file_ids": [],
-                    }
+                _ZIP_JOBS[token] = {
+                    "file_path": str(latest_export),
+                    "download_name": download_name,
+                    "artifact_type": "zip",
+                    "mime_type": "application/zip",
+                    "file_ids": [],
+                    "etag": etag,
+                }
             else:
                 # No timestamped export found; queue a fresh build (no canonical cache fallback)
                 _write_progress(
@@ -2463,15 +2709,14 @@ def handle_large_request(e):
                         "filter_context": {},
                     },
                 )
-                with _ZIP_JOBS_LOCK:
-                    _ZIP_JOBS[token] = {
-                        "file_path": None,
-                        "download_name": download_name,
-                        "artifact_type": "zip",
-                        "mime_type": "application/zip",
-                        "file_ids": [],
-                        "filter_context": {},
-                    }
+                _ZIP_JOBS[token] = {
+                    "file_path": None,
+                    "download_name": download_name,
+                    "artifact_type": "zip",
+                    "mime_type": "application/zip",
+                    "file_ids": [],
+                    "filter_context": {},
+                }
                 # Start background builder to create the all-files zip
                 all_file_pairs = get_all_current_file_paths()
                 if not all_file_pairs:
@@ -2479,19 +2724,15 @@ def handle_large_request(e):
                         jsonify({"ok": False, "error": "No current files found"}),
                         404,
                     )
-                t = threading.Thread(
-                    target=_build_zip_in_background,
-                    args=(
-                        token,
-                        [(name, path) for name, path in all_file_pairs],
-                        download_name,
-                        None,
-                        None,
-                        {},
-                    ),
-                    daemon=True,
+                _ZIP_WORKERS.submit(
+                    _build_zip_in_background,
+                    token,
+                    [(name, path) for name, path in all_file_pairs],
+                    download_name,
+                    None,
+                    None,
+                    {},
                 )
-                t.start()
             response = jsonify(
                 {
                     "ok": True,
@@ -2527,9 +2768,7 @@ def download_selected_file(token: str):
     if not data or not data.get("done"):
         abort(404)
     # Prefer registered path (background worker sets it)
-    job_data = None
-    with _ZIP_JOBS_LOCK:
-        job_data = _ZIP_JOBS.get(token)
+    job_data = _ZIP_JOBS.get(token)
     download_name = (
         data.get("download_name")
         or (job_data or {}).get("download_name")
@@ -2552,6 +2791,7 @@ def download_selected_file(token: str):
         or data.get("mime_type")
         or ("application/zip" if artifact_type == "zip" else None)
     )
+    etag = (job_data or {}).get("etag") or data.get("etag")
     file_path_str = (job_data or {}).get("file_path") or data.get("file_path")
     file_path: Optional[Path] = Path(file_path_str) if file_path_str else None
     if artifact_type == "zip" and (file_path is None or not file_path.exists()):
@@ -2574,9 +2814,6 @@ def download_selected_file(token: str):
         )
     # If the ZIP already contains a link file, serve it directly and set headers
     try:
-        import re
-        import zipfile
-
         with zipfile.ZipFile(file_path, "r") as zf:
             if "_PERMANENT_DOWNLOAD_LINK.txt" in zf.namelist():
                 try:
@@ -2589,11 +2826,7 @@ def download_selected_file(token: str):
                 snapshot_id = m.group(1) if m else None
                 c = re.search(r"[?&]context=([0-9a-f]{16})", txt)
                 context_id = c.group(1) if c else None
-                resp = send_file(
-                    file_path,
-                    as_attachment=True,
-                    download_name=download_name,
-                )
+                resp = _send_zip_artifact(file_path, download_name, etag)
                 if snapshot_id:
                     resp.headers["X-Download-Snapshot-ID"] = snapshot_id
                     resp.headers["X-Download-Snapshot-URL"] = _snapshot_external_url(
@@ -2606,20 +2839,15 @@ def download_selected_file(token: str):
     # If we have captured IDs (legacy/no-link case), create a snapshot and inject link file into the ZIP on the fly
     if captured_ids:
         try:
-            from .services.snapshot_service import add_link_to_existing_zip as _add_link
-            from .services.snapshot_service import (
-                create_download_snapshot_from_ids as _create_snapshot_from_ids,
-            )
-
             base_url = request.host_url.rstrip("/")
             # Legacy zip without link: inject into memory
-            snapshot_id = _create_snapshot_from_ids(captured_ids, download_name)
+            snapshot_id = _create_download_snapshot_from_ids(captured_ids, download_name)
             context_id = _create_snapshot_context(
                 snapshot_id=snapshot_id,
                 download_name=download_name,
                 filters=filter_context,
             )
-            mem = _add_link(
+            mem = _add_link_to_existing_zip(
                 file_path,
                 snapshot_id,
                 download_name,
@@ -2640,9 +2868,9 @@ def download_selected_file(token: str):
             return response
         except Exception:
             # Fall back to serving the raw ZIP if snapshot injection fails
-            return send_file(file_path, as_attachment=True, download_name=download_name)
+            return _send_zip_artifact(file_path, download_name, etag)
     # No captured IDs; serve raw ZIP
-    return send_file(file_path, as_attachment=True, download_name=download_name)
+    return _send_zip_artifact(file_path, download_name, etag)
 
 
 @bp.get("/download/snapshot/<snapshot_id>")
@@ -2662,17 +2890,61 @@ def download_snapshot(snapshot_id: str):
     return _serve_snapshot_download(token, context_id=context_id)
 
 
-def _order_columns(all_keys: List[str], preferred_order: List[str]) -> List[str]:
+# Preview ordering: these keys/columns come first (in this order), the rest
+# follow alphabetically
+_PREVIEW_META_KEYS = (
+    "country",
+    "unit",
+    "city",
+    "district",
+    "subunit",
+    "instance",
+    "year",
+    "date_begin",
+    "date_end",
+    "budget",
+    "currency",
+    "num_projects",
+    "num_votes",
+    "vote_type",
+    "rule",
+    "description",
+    "comment",
+)
+_PREVIEW_META_INDEX = {k: i for i, k in enumerate(_PREVIEW_META_KEYS)}
+_PREVIEW_PROJECT_COLS = (
+    "project_id",
+    "name",
+    "title",
+    "cost",
+    "score",
+    "votes",
+    "selected",
+    "category",
+    "district",
+    "description",
+)
+_PREVIEW_VOTE_COLS = (
+    "voter_id",
+    "vote",
+    "ranking",
+    "points",
+    "weight",
+    "age",
+    "gender",
+    "district",
+)
+
+
+def _order_columns(all_keys: Iterable[str], preferred_order: Iterable[str]) -> List[str]:
+    all_set = set(all_keys)
     seen = set()
     cols: List[str] = []
     for k in preferred_order:
-        if k in all_keys and k not in seen:
-            cols.append(k)
-            seen.add(k)
-    for k in sorted(all_keys):
-        if k not in seen:
+        if k in all_set and k not in seen:
             cols.append(k)
             seen.add(k)
+    cols.extend(sorted(all_set - seen))
     return cols
 
 
@@ -2714,14 +2986,16 @@ def preview_file(filename: str):
         checker_validation = _load_checker_validation_payload(file_row, cache_row)
     if not path.exists() or not path.is_file():
         abort(404)
+    # For very large votes tables, only the first N rows are materialized;
+    # the rest are just counted. Can expand on client.
+    VOTES_PREVIEW_LIMIT = 200
     try:
-        with path.open("r", encoding="utf-8", newline="") as f:
-            lines = [line.rstrip("\n") for line in f]
-        meta, projects, votes, votes_in_projects, scores_in_projects = parse_pb_lines(
-            lines
-        )
+        preview = _parse_pb_preview_cached(path, VOTES_PREVIEW_LIMIT)
     except Exception as e:
         abort(400, description=f"Failed to parse file: {e}")
+    meta, projects = preview.meta, preview.projects
+    votes_in_projects = preview.votes_in_projects
+    scores_in_projects = preview.scores_in_projects
 
     # Prepare META as list of (key, value) sorted with some preferred keys on top
     # Ensure comments are split using the same logic as elsewhere (#n: ...)
@@ -2735,85 +3009,31 @@ def preview_file(filename: str):
     except Exception:
         # Fallback: leave original comment value as-is
         pass
-    meta_items = list(meta_processed.items())
-    preferred_meta = [
-        "country",
-        "unit",
-        "city",
-        "district",
-        "subunit",
-        "instance",
-        "year",
-        "date_begin",
-        "date_end",
-        "budget",
-        "currency",
-        "num_projects",
-        "num_votes",
-        "vote_type",
-        "rule",
-        "description",
-        "comment",
+    # Preferred keys first (in that order), then the rest alphabetically
+    meta_items = [
+        (k, meta_processed[k]) for k in _PREVIEW_META_KEYS if k in meta_processed
     ]
-    # Sort with preferred keys first (in that order), then the rest alphabetically
-    meta_order_map = {k: i for i, k in enumerate(preferred_meta)}
-    meta_items.sort(
-        key=lambda kv: (
-            kv[0] not in meta_order_map,
-            meta_order_map.get(kv[0], 9999),
-            kv[0],
-        )
+    meta_items.extend(
+        (k, meta_processed[k])
+        for k in sorted(k for k in meta_processed if k not in _PREVIEW_META_INDEX)
     )
 
-    # Prepare PROJECTS table
-    project_rows: List[Dict[str, Any]] = []
-    project_keys_set = set()
-    for pid, row in projects.items():
-        # ensure project_id exists in row
-        r = dict(row)
-        r.setdefault("project_id", pid)
-        project_rows.append(r)
-        project_keys_set.update(r.keys())
-    preferred_project_cols = [
-        "project_id",
-        "name",
-        "title",
-        "cost",
-        "score",
-        "votes",
-        "selected",
-        "category",
-        "district",
-        "description",
-    ]
-    project_columns = _order_columns(list(project_keys_set), preferred_project_cols)
-
-    # Prepare VOTES table (may be large)
-    vote_rows: List[Dict[str, Any]] = []
-    vote_keys_set = set(["voter_id"])  # we include voter_id explicitly
-    for vid, row in votes.items():
-        r = {"voter_id": vid}
-        r.update(row)
-        vote_rows.append(r)
-        vote_keys_set.update(r.keys())
-    # The 'vote' field is included in preferred_vote_cols and vote_columns,
+    # Prepare PROJECTS table. Parsed rows already carry project_id/voter_id and
+    # the template only reads them, so they are passed through without copying.
+    project_rows: List[Dict[str, Any]] = list(projects.values())
+    project_keys_set = {"project_id"}
+    for row in project_rows:
+        project_keys_set.update(row)
+    project_columns = _order_columns(project_keys_set, _PREVIEW_PROJECT_COLS)
+
+    # Prepare VOTES table; columns cover all rows, not just the previewed ones
+    vote_keys_set = {"voter_id"} | preview.vote_keys  # voter_id explicitly
+    # The 'vote' field is included in _PREVIEW_VOTE_COLS and vote_columns,
     # and will be shown in the preview table. It is a list of project IDs if present.
-    preferred_vote_cols = [
-        "voter_id",
-        "vote",
-        "ranking",
-        "points",
-        "weight",
-        "age",
-        "gender",
-        "district",
-    ]
-    vote_columns = _order_columns(list(vote_keys_set), preferred_vote_cols)
+    vote_columns = _order_columns(vote_keys_set, _PREVIEW_VOTE_COLS)
 
-    # For very large votes tables, show only first N by default; can expand on client
-    VOTES_PREVIEW_LIMIT = 200
-    total_votes_count = len(vote_rows)
-    votes_preview = vote_rows[:VOTES_PREVIEW_LIMIT]
+    total_votes_count = preview.total_votes
+    votes_preview = list(preview.votes.values())
     votes_truncated = total_votes_count > VOTES_PREVIEW_LIMIT
 
     # Basic counts for header
@@ -2950,6 +3170,32 @@ def preview_rule_comparison(filename: str):
     return jsonify(comparison)
 
 
+# Rendered visualization pages by file id, as (key, html). Chart data is fixed
+# for a given file version, so a repeat view skips the stored-JSON load and
+# the template's per-chart JSON encoding. Least recently viewed pages are
+# dropped first.
+_VIZ_HTML: "OrderedDict[int, Tuple[Tuple[Any, ...], str]]" = OrderedDict()
+_VIZ_HTML_MAX = 64
+_VIZ_HTML_LOCK = threading.Lock()
+
+
+def _viz_html_get(file_id: int, key: Tuple[Any, ...]) -> Optional[str]:
+    with _VIZ_HTML_LOCK:
+        hit = _VIZ_HTML.get(file_id)
+        if hit is not None and hit[0] == key:
+            _VIZ_HTML.move_to_end(file_id)
+            return hit[1]
+    return None
+
+
+def _viz_html_put(file_id: int, key: Tuple[Any, ...], html: str) -> None:
+    with _VIZ_HTML_LOCK:
+        _VIZ_HTML[file_id] = (key, html)
+        _VIZ_HTML.move_to_end(file_id)
+        while len(_VIZ_HTML) > _VIZ_HTML_MAX:
+            _VIZ_HTML.popitem(last=False)
+
+
 @bp.route("/visualize/<path:filename>")
 def visualize_file(filename: str):
     """Generate visualization page for a PB file with charts and plots."""
@@ -2972,6 +3218,12 @@ def visualize_file(filename: str):
         path = Path(pb_file.path)
         if not path.exists() or not path.is_file():
             abort(404)
+
+        file_id = pb_file.id
+        key = (pb_file.file_mtime, request.base_url, datetime.utcnow().date())
+        cached = _viz_html_get(file_id, key)
+        if cached is not None:
+            return cached
         
         # Get or compute visualization data (with caching)
         try:
@@ -2986,7 +3238,7 @@ def visualize_file(filename: str):
             abort(400, description=f"Failed to generate visualization: {e}")
     
     # Extract data from cached viz_data for template
-    return render_template(
+    html = render_template(
         "visualize.html",
         filename=viz_data.get("filename", filename),
         counts=viz_data.get("counts", {}),
@@ -3006,6 +3258,12 @@ def visualize_file(filename: str):
         project_categories=viz_data.get("project_categories", False),
         voter_demographics=viz_data.get("voter_demographics", False),
     )
+    _viz_html_put(file_id, key, html)
+    return html
+
+
+# Block size for reading the head of a file in preview_snippet
+_SNIPPET_READ_BYTES = 64 * 1024
 
 
 @bp.route("/preview-snippet/<path:filename>")
@@ -3014,7 +3272,11 @@ def preview_snippet(filename: str):
     if not _is_safe_filename(filename):
         abort(400, description="Invalid filename")
     path = get_current_file_path(filename)
-    if not path or not path.exists() or not path.is_file():
+    try:
+        st = path.stat() if path else None
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         abort(404)
 
     # Number of lines to include; default 80, cap 400
@@ -3024,15 +3286,35 @@ def preview_snippet(filename: str):
         n = 80
     n = max(1, min(n, 400))
 
+    # The snippet only changes with the file, so repeat views revalidate
+    # against its stat and skip the read
+    etag = f"{st.st_mtime_ns:x}-{st.st_size:x}-{n}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
     try:
-        with path.open("r", encoding="utf-8", newline="") as f:
-            lines = []
-            for i, line in enumerate(f, start=1):
-                if i > n:
+        # Read raw blocks until N line breaks are in hand, then split once
+        # and decode only the kept lines
+        with path.open("rb") as f:
+            buf = b""
+            seen = 0
+            while seen < n:
+                block = f.read(_SNIPPET_READ_BYTES)
+                if not block:
                     break
-                lines.append(line.rstrip("\n"))
-        text = "\n".join(lines)
+                buf += block
+                seen += block.count(b"\n")
+        parts = buf.split(b"\n", n)[:n]
+        if seen < n and not parts[-1]:
+            # Hit EOF: a trailing newline does not start another line
+            parts.pop()
+        text = b"\n".join(parts).decode("utf-8")
     except Exception as e:
         abort(400, description=f"Failed to read file: {e}")
 
-    return Response(text, mimetype="text/plain; charset=utf-8")
+    response = Response(text, mimetype="text/plain; charset=utf-8")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
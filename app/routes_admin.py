@@ -6,10 +6,13 @@ import re
 import shutil
 import tempfile
 import threading
+import time
 import uuid
 import zipfile
 import difflib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -53,10 +56,12 @@ from .services.snapshot_service import (
 from .utils.formatting import format_budget as _format_budget
 from .utils.formatting import format_int as _format_int
 from .utils.formatting import format_vote_length as _format_vote_length
+from .utils.file_helpers import list_pb_files as _list_pb_files
 from .utils.filename_normalization import normalize_storage_filename
-from .utils.load_pb_file import parse_pb_lines as _parse_pb_lines
 from .utils.pb_utils import build_group_key as _build_group_key
+from .utils.pb_utils import parse_pb_file_cached as _parse_pb_file_cached
 from .utils.pb_utils import parse_pb_to_tile as _parse_pb_to_tile
+from .utils.pb_utils import parse_pb_to_tile_cached as _parse_pb_to_tile_cached
 from .utils.pb_utils import pb_depreciated_folder as _pb_depr_folder
 from .utils.pb_utils import pb_folder as _pb_folder
 from .utils.security import (
@@ -1025,85 +1030,96 @@ def _extract_deletion_timestamp(file_path: str) -> Optional[datetime]:
     return None
 
 
-def _list_tmp_tiles() -> list[dict]:
-    tmp_dir = _tmp_upload_dir()
-    tiles: list[dict] = []
-    for p in sorted(tmp_dir.glob("*.pb")):
-        if not is_safe_regular_file(p, tmp_dir):
-            continue
+def _build_tmp_tile(p: Path, tmp_dir: Path) -> Optional[dict]:
+    """Preview tile (with validation) for one staged file, or None if unsafe.
+
+    Runs on a worker thread (see ``_list_tmp_tiles``), so it must not touch
+    the Flask request context or a shared DB session.
+    """
+    if not is_safe_regular_file(p, tmp_dir):
+        return None
+    try:
+        t = _parse_pb_to_tile_cached(p)
+        tile_data = _format_preview_tile(t)
+        # Add upload date
+        tile_data["upload_date"] = datetime.fromtimestamp(p.stat().st_mtime).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        # Public submission marker
         try:
-            t = _parse_pb_to_tile(p)
-            tile_data = _format_preview_tile(t)
-            # Add upload date
-            tile_data["upload_date"] = datetime.fromtimestamp(p.stat().st_mtime).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
-            # Public submission marker
+            import json
+
+            marker_path = _tmp_public_marker_path(p.name)
+            if marker_path.exists():
+                with open(marker_path, "r") as mf:
+                    marker = json.load(mf) or {}
+                tile_data["public_submission"] = bool(
+                    marker.get("public_submission")
+                )
+                tile_data["submitted_email"] = marker.get("email") or ""
+            else:
+                tile_data["public_submission"] = False
+                tile_data["submitted_email"] = ""
+        except Exception:
+            tile_data["public_submission"] = False
+            tile_data["submitted_email"] = ""
+
+        # Add validation - check for cached validation first
+        validation_cache_path = _tmp_validation_cache_path(p.name)
+        validation = _load_tmp_validation_cache(p)
+
+        # If no cached validation, validate and cache it
+        if validation is None:
+            validation = validate_pb_file(p)
+            # Cache the validation result
             try:
                 import json
 
-                marker_path = _tmp_public_marker_path(p.name)
-                if marker_path.exists():
-                    with open(marker_path, "r") as mf:
-                        marker = json.load(mf) or {}
-                    tile_data["public_submission"] = bool(
-                        marker.get("public_submission")
-                    )
-                    tile_data["submitted_email"] = marker.get("email") or ""
-                else:
-                    tile_data["public_submission"] = False
-                    tile_data["submitted_email"] = ""
+                with open(validation_cache_path, "w") as f:
+                    json.dump(validation, f)
             except Exception:
-                tile_data["public_submission"] = False
-                tile_data["submitted_email"] = ""
-
-            # Add validation - check for cached validation first
-            validation_cache_path = _tmp_validation_cache_path(p.name)
-            validation = _load_tmp_validation_cache(p)
+                pass  # If cache write fails, continue without caching
 
-            # If no cached validation, validate and cache it
-            if validation is None:
-                validation = validate_pb_file(p)
-                # Cache the validation result
-                try:
-                    import json
+        tile_data["validation"] = validation
+        tile_data["validation_summary"] = format_validation_summary(validation)
+        issue_counts = count_issues(validation)
+        tile_data["error_count"] = issue_counts["errors"]
+        tile_data["warning_count"] = issue_counts["warnings"]
 
-                    with open(validation_cache_path, "w") as f:
-                        json.dump(validation, f)
-                except Exception:
-                    pass  # If cache write fails, continue without caching
+        return tile_data
+    except Exception as e:
+        # Skip unreadable files, but still show a minimal entry
+        return {
+            "file_name": p.name,
+            "title": p.stem.replace("_", " "),
+            "description": "(Failed to parse)",
+            "num_votes": "—",
+            "num_projects": "—",
+            "budget": "—",
+            "vote_type": "",
+            "vote_length": "—",
+            "validation": {
+                "valid": False,
+                "errors": None,
+                "warnings": None,
+                "error_message": f"Parse error: {e.__class__.__name__}: {str(e)}. This file cannot be checked and is likely corrupted or malformed.",
+            },
+            "validation_summary": f"⚠ Parse error: {e.__class__.__name__}: {str(e)}. File likely corrupted.",
+            "error_count": 0,
+            "warning_count": 0,
+        }
 
-            tile_data["validation"] = validation
-            tile_data["validation_summary"] = format_validation_summary(validation)
-            issue_counts = count_issues(validation)
-            tile_data["error_count"] = issue_counts["errors"]
-            tile_data["warning_count"] = issue_counts["warnings"]
 
-            tiles.append(tile_data)
-        except Exception as e:
-            # Skip unreadable files, but still show a minimal entry
-            tiles.append(
-                {
-                    "file_name": p.name,
-                    "title": p.stem.replace("_", " "),
-                    "description": "(Failed to parse)",
-                    "num_votes": "—",
-                    "num_projects": "—",
-                    "budget": "—",
-                    "vote_type": "",
-                    "vote_length": "—",
-                    "validation": {
-                        "valid": False,
-                        "errors": None,
-                        "warnings": None,
-                        "error_message": f"Parse error: {e.__class__.__name__}: {str(e)}. This file cannot be checked and is likely corrupted or malformed.",
-                    },
-                    "validation_summary": f"⚠ Parse error: {e.__class__.__name__}: {str(e)}. File likely corrupted.",
-                    "error_count": 0,
-                    "warning_count": 0,
-                }
-            )
-    return tiles
+def _list_tmp_tiles() -> list[dict]:
+    tmp_dir = _tmp_upload_dir()
+    paths = _list_pb_files(tmp_dir)
+    if not paths:
+        return []
+    # Parsing and validation are independent per file; first loads of a
+    # large staging folder fan out like the public session listing does
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+        built = list(ex.map(lambda p: _build_tmp_tile(p, tmp_dir), paths))
+    return [t for t in built if t is not None]
 
 
 def _format_preview_tile(tile: dict) -> dict:
@@ -1259,7 +1275,7 @@ def upload_tiles_post():
 
     # Build a map of existing temp files by webpage_name for duplicate checking
     existing_temp_files = {}  # webpage_name -> filename
-    for existing_file in tmp_dir.glob("*.pb"):
+    for existing_file in _list_pb_files(tmp_dir):
         if not is_safe_regular_file(existing_file, tmp_dir):
             continue
         try:
@@ -1512,7 +1528,7 @@ def upload_tiles_post():
     if request.headers.get("X-Requested-With") == "fetch" or request.is_json:
         # Recompute remaining capacity after saves
         try:
-            new_existing_count = sum(1 for _ in _tmp_upload_dir().glob("*.pb"))
+            new_existing_count = len(_list_pb_files(_tmp_upload_dir()))
         except Exception:
             new_existing_count = len(tiles)
         return jsonify(
@@ -2241,7 +2257,7 @@ def upload_tiles_download_selected_start():
         return jsonify({"ok": False, "error": "Files not found"}), 404
     token = uuid.uuid4().hex
     download_name = (
-        f"temp_selected_{len(files)}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+        f"temp_selected_{len(files)}_{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}.zip"
     )
     _admin_write_progress(
         token,
@@ -2352,7 +2368,7 @@ def upload_tiles_validate():
 
         # Print progress to console for server logs
         webpage_name = tile_data.get("webpage_name") if tile_data else fname
-        current_app.logger.info(f"Processing file: `{webpage_name}`...")
+        current_app.logger.info("Processing file: `%s`...", webpage_name)
 
         # Check for cached validation first
         validation_cache_path = _tmp_validation_cache_path(fname)
@@ -2495,9 +2511,10 @@ def upload_tiles_preview_data():
         return jsonify({"error": "File not found"}), 404
 
     try:
-        with file_path.open("r", encoding="utf-8", newline="") as fh:
-            lines = [line.rstrip("\n") for line in fh]
-        meta, projects, votes, _votes_in_proj, _scores_in_proj = _parse_pb_lines(lines)
+        # "Show more" re-requests the same file; the parse is reused until it changes
+        meta, projects, votes, _votes_in_proj, _scores_in_proj = _parse_pb_file_cached(
+            file_path
+        )
     except Exception as e:
         return jsonify({"error": f"Parse error: {e}"}), 400
 
@@ -2533,10 +2550,10 @@ def upload_tiles_preview_data():
         "year", "date_begin", "date_end", "budget", "currency",
         "num_projects", "num_votes", "vote_type", "rule", "description", "comment",
     ]
-    meta_order = {k: i for i, k in enumerate(preferred_meta)}
-    meta_items = sorted(
-        list(meta.items()),
-        key=lambda kv: (kv[0] not in meta_order, meta_order.get(kv[0], 9999), kv[0]),
+    preferred_set = set(preferred_meta)
+    meta_items = [(k, meta[k]) for k in preferred_meta if k in meta]
+    meta_items.extend(
+        (k, meta[k]) for k in sorted(k for k in meta if k not in preferred_set)
     )
 
     # ---- PROJECTS ----
@@ -2554,13 +2571,10 @@ def upload_tiles_preview_data():
     project_columns = _order_cols(list(project_keys), preferred_proj)
 
     # ---- VOTES ----
-    vote_rows_raw: List[Dict[str, Any]] = []
-    vote_keys: set = set()
-    for vid, row in votes.items():
-        r = {"voter_id": vid}
-        r.update(row)
-        vote_rows_raw.append(r)
-        vote_keys.update(r.keys())
+    # Columns cover every voter; row dicts are built only for the rows returned
+    vote_keys: set = {"voter_id"}
+    for row in votes.values():
+        vote_keys.update(row)
     preferred_votes = [
         "voter_id", "vote", "ranking", "points", "weight",
         "age", "gender", "district",
@@ -2571,7 +2585,11 @@ def upload_tiles_preview_data():
         return [str(row.get(c, "")) for c in cols]
 
     project_limit = _parse_limit(data.get("project_limit"), len(project_rows_raw))
-    vote_limit = _parse_limit(data.get("vote_limit"), len(vote_rows_raw))
+    vote_limit = _parse_limit(data.get("vote_limit"), len(votes))
+    vote_rows = [
+        _serialise_row({"voter_id": vid, **row}, vote_columns)
+        for vid, row in islice(votes.items(), vote_limit)
+    ]
 
     return jsonify({
         "ok": True,
@@ -2583,8 +2601,8 @@ def upload_tiles_preview_data():
         "total_projects": len(project_rows_raw),
         "project_limit": project_limit,
         "vote_columns": vote_columns,
-        "vote_rows": [_serialise_row(r, vote_columns) for r in vote_rows_raw[:vote_limit]],
-        "total_votes": len(vote_rows_raw),
+        "vote_rows": vote_rows,
+        "total_votes": len(votes),
         "vote_limit": vote_limit,
     })
 
@@ -2687,16 +2705,14 @@ def upload_tiles_diff_data():
         return jsonify({"error": "Current dataset file is missing on disk."}), 404
 
     try:
-        with current_path.open("r", encoding="utf-8", newline="") as fh_old:
-            old_lines = [line.rstrip("\n") for line in fh_old]
-        old_meta, old_projects, _old_votes, _a, _b = _parse_pb_lines(old_lines)
+        old_meta, old_projects, _old_votes, _a, _b = _parse_pb_file_cached(
+            current_path
+        )
     except Exception as e:
         return jsonify({"error": f"Parse error (current): {e}"}), 400
 
     try:
-        with tmp_path.open("r", encoding="utf-8", newline="") as fh_new:
-            new_lines = [line.rstrip("\n") for line in fh_new]
-        new_meta, new_projects, _new_votes, _c, _d = _parse_pb_lines(new_lines)
+        new_meta, new_projects, _new_votes, _c, _d = _parse_pb_file_cached(tmp_path)
     except Exception as e:
         return jsonify({"error": f"Parse error (temp): {e}"}), 400
 
@@ -3608,7 +3624,7 @@ def admin_export_create():
         return redirect(url_for("admin.admin_export_index", message=err, success=0))
 
     # Gather all .pb files in pb_files
-    files: list[Path] = [p for p in sorted(pb_dir.glob("*.pb")) if p.is_file()]
+    files: list[Path] = _list_pb_files(pb_dir)
     if not files:
         err = "No .pb files found in pb_files"
         if request.is_json:
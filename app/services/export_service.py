@@ -12,7 +12,11 @@ from typing import List, Tuple
 
 from ..db import get_session
 from ..models import PBFile
+from ..utils.file_helpers import list_pb_files as _list_pb_files
 from ..utils.pb_utils import pb_folder as _pb_folder
+from ..utils.zip_utils import WRITE_BUFFER_BYTES as _ZIP_WRITE_BUFFER_BYTES
+from ..utils.zip_utils import prune_deflate_cache as _prune_deflate_cache
+from ..utils.zip_utils import write_files as _zip_write_files
 from .snapshot_service import create_link_text_file as _create_link_text_file
 from .snapshot_service import (
     create_snapshot_for_cache_file as _create_snapshot_for_cache_file,
@@ -96,6 +100,28 @@ def _save_signature(sig: str, relpath: str | None) -> None:
         pass
 
 
+def latest_export_zip(zip_name: str = "all_pb_files.zip") -> Path | None:
+    """Return the newest timestamped export ``cache/<ts>/<zip_name>``, if any.
+
+    Scans one directory level with a single stat per candidate. The zip
+    recorded in the signature file is not trusted on its own: admin exports
+    and request-time builds write newer ones without updating it.
+    """
+    latest: Path | None = None
+    latest_mtime = 0.0
+    try:
+        for p in _cache_dir().glob(f"*/{zip_name}"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            if latest is None or st.st_mtime > latest_mtime:
+                latest, latest_mtime = p, st.st_mtime
+    except Exception:
+        return None
+    return latest
+
+
 def _build_zip(zip_name: str = "all_pb_files.zip") -> Path:
     """Build a fresh ZIP of all .pb files currently on disk in pb_files/.
 
@@ -104,7 +130,7 @@ def _build_zip(zip_name: str = "all_pb_files.zip") -> Path:
     without any request-time mutation.
     """
     pb_dir = _pb_folder()
-    files = [p for p in sorted(pb_dir.glob("*.pb")) if p.is_file()]
+    files = _list_pb_files(pb_dir)
     if not files:
         raise RuntimeError("No .pb files found to export")
 
@@ -113,24 +139,24 @@ def _build_zip(zip_name: str = "all_pb_files.zip") -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
     out_zip = out_dir / zip_name
 
-    with zipfile.ZipFile(out_zip, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for p in files:
-            zf.write(p, arcname=p.name)
-        # Create or reuse a snapshot for the current set, and write link note
-        try:
-            # This uses the current DB set at build time, matching files we just zipped
-            snapshot_id = _create_snapshot_for_cache_file(download_name=out_zip.name)
-            base_url = os.environ.get("PUBLIC_BASE_URL", "").rstrip("/")
-            link_txt = _create_link_text_file(
-                snapshot_id,
-                out_zip.name,
-                base_url,
-                file_count=len(files),
-            )
-            zf.writestr("_PERMANENT_DOWNLOAD_LINK.txt", link_txt.encode("utf-8"))
-        except Exception:
-            # Non-fatal: zip will still be usable without the link file
-            pass
+    with open(out_zip, "wb", buffering=_ZIP_WRITE_BUFFER_BYTES) as fh:
+        with zipfile.ZipFile(fh, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+            _zip_write_files(zf, [(p.name, p) for p in files])
+            # Create or reuse a snapshot for the current set, and write link note
+            try:
+                # This uses the current DB set at build time, matching files we just zipped
+                snapshot_id = _create_snapshot_for_cache_file(download_name=out_zip.name)
+                base_url = os.environ.get("PUBLIC_BASE_URL", "").rstrip("/")
+                link_txt = _create_link_text_file(
+                    snapshot_id,
+                    out_zip.name,
+                    base_url,
+                    file_count=len(files),
+                )
+                zf.writestr("_PERMANENT_DOWNLOAD_LINK.txt", link_txt.encode("utf-8"))
+            except Exception:
+                # Non-fatal: zip will still be usable without the link file
+                pass
 
     return out_zip
 
@@ -155,6 +181,12 @@ def build_if_changed(zip_name: str = "all_pb_files.zip") -> Path | None:
         # Store relpath relative to cache for convenience
         relpath = out_zip.relative_to(_cache_dir())
         _save_signature(sig, str(relpath).replace("\\", "/"))
+        # The set changed, so some cached member blobs may now be orphaned
+        try:
+            _prune_deflate_cache()
+        except Exception:
+            # non-fatal
+            pass
         return out_zip
 
 
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+from collections import Counter
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
+import heapq
+import logging
+import os
 import re
+import threading
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, asc, desc, func, or_
@@ -21,7 +28,7 @@ from ..utils.formatting import (
     format_short_number,
     format_vote_length,
 )
-from ..utils.load_pb_file import parse_pb_lines as _parse_pb_lines
+from ..utils.load_pb_file import parse_pb_file_meta as _parse_pb_file_meta
 from ..utils.search_normalization import build_search_text_norm, fold_search_text
 from ..utils.validation import (
     checker_public_label,
@@ -30,14 +37,13 @@ from ..utils.validation import (
     checker_public_tooltip,
 )
 
-# Optional optimization helper (load_only)
-try:  # pragma: no cover
-    from sqlalchemy.orm import load_only as _sa_load_only  # type: ignore
-except Exception:  # pragma: no cover
-    _sa_load_only = None  # type: ignore
-
+_logger = logging.getLogger(__name__)
 
 _TILES_CACHE: Optional[List[Dict[str, Any]]] = None
+# file id -> (row values, comments, tile) from the last tiles build; rows that
+# come back unchanged reuse their tile instead of being formatted again.
+# Survives invalidate_caches() on purpose: entries are checked, not trusted.
+_TILES_BY_ID: Dict[int, Tuple[Tuple[Any, ...], List[str], Dict[str, Any]]] = {}
 _COMMENTS_CACHE: Optional[
     Tuple[
         Dict[str, List[str]],
@@ -76,6 +82,32 @@ _RULES_CACHE: Optional[
     ]
 ] = None
 _CITY_SLUG_CACHE: Optional[Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]] = None
+# (fetched_at monotonic seconds, count); cleared by invalidate_caches(), and the
+# TTL bounds staleness for ingests done by other worker processes
+_CURRENT_FILE_COUNT_CACHE: Optional[Tuple[float, int]] = None
+_CURRENT_FILE_COUNT_TTL = 30.0
+# Bumped by invalidate_caches(), so callers keeping their own derived data
+# (e.g. rendered pages) can tell it went stale in this process
+_CACHE_GENERATION = 0
+# (fetched_at monotonic seconds, signature) for _db_signature(); cleared by
+# invalidate_caches(), and the TTL bounds how long an ingest or admin change
+# done by another process (db_refresh, another gunicorn worker) goes unnoticed
+_DB_SIGNATURE_CACHE: Optional[Tuple[float, str]] = None
+_DB_SIGNATURE_TTL = 5.0
+# _db_signature() each cached aggregate above was built under, by cache name.
+# Kept apart from the values: they are lists/tuples, which take no attributes.
+_CACHE_SIGS: Dict[str, Optional[str]] = {}
+# cache name -> (source rows, result) of the last comments/stats build. A
+# signature change (e.g. a checker run) that leaves those rows as they were
+# reuses the result instead of aggregating again; like _TILES_BY_ID this
+# survives invalidate_caches().
+_AGGREGATE_SOURCES: Dict[str, Tuple[List[Any], Any]] = {}
+# One rebuild per cache at a time: requests that miss while a rebuild is in
+# flight wait for it and reuse the result instead of querying again.
+_CACHE_LOCKS: Dict[str, threading.Lock] = {
+    kind: threading.Lock()
+    for kind in ("tiles", "comments", "category", "beneficiary", "rules", "stats")
+}
 
 _SEARCH_ORDER_COLUMNS = {
     "quality": PBFile.quality,
@@ -251,28 +283,10 @@ def _read_meta_only(path: Path) -> Dict[str, Any]:
     constraints (min_length/max_length/max_sum_cost, etc.).
     """
     try:
-        lines: List[str] = []
         with path.open("r", encoding="utf-8", newline="") as f:
-            in_meta = False
-            for raw in f:
-                line = raw.rstrip("\n")
-                up = line.strip().upper()
-                if up == "META":
-                    in_meta = True
-                    lines.append("META")
-                    continue
-                if not in_meta:
-                    # skip preamble until META
-                    continue
-                # include header row and subsequent rows until next section
-                if up in {"PROJECTS", "VOTES"}:
-                    break
-                lines.append(line)
-        if not lines:
-            return {}
-        meta, _projects, _votes, _v_in_p, _s_in_p = _parse_pb_lines(lines)
+            meta = _parse_pb_file_meta(f)
         # normalize keys to lowercase for robust lookups
-        return {str(k).strip().lower(): v for k, v in (meta or {}).items()}
+        return {str(k).strip().lower(): v for k, v in meta.items()}
     except Exception:
         return {}
 
@@ -414,6 +428,18 @@ def _compute_cumulative_points_from_meta(
 
 
 def _db_signature() -> Optional[str]:
+    global _DB_SIGNATURE_CACHE
+    cached = _DB_SIGNATURE_CACHE
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _DB_SIGNATURE_TTL:
+        return cached[1]
+    sig = _read_db_signature()
+    # A failed read (None) is not cached, so the next call retries
+    _DB_SIGNATURE_CACHE = (now, sig) if sig is not None else None
+    return sig
+
+
+def _read_db_signature() -> Optional[str]:
     try:
         with get_session() as s:
             rs = s.get(RefreshState, "pb")
@@ -432,13 +458,56 @@ def _db_signature() -> Optional[str]:
                 if checker_sig_row and checker_sig_row[0]
                 else ""
             )
-            return f"{refresh_sig}|{checker_sig}"
+            # Admin deletes and replacements flip is_current without touching
+            # either stamp above; this lets other workers notice them
+            count, max_id, max_ingested = _current_files_stamp(s)
+            files_sig = f"{count}:{max_id or 0}:" + (
+                max_ingested.isoformat() if max_ingested else ""
+            )
+            return f"{refresh_sig}|{checker_sig}|{files_sig}"
+    except Exception:
+        return None
+
+
+def _current_files_stamp(s) -> Tuple[int, Optional[int], Optional[datetime]]:
+    row = (
+        s.query(
+            func.count(PBFile.id),
+            func.max(PBFile.id),
+            func.max(PBFile.ingested_at),
+        )
+        .filter(PBFile.is_current == True)  # noqa: E712
+        .one()
+    )
+    return int(row[0] or 0), row[1], row[2]
+
+
+def cache_signature() -> Tuple[int, Optional[str]]:
+    """(in-process invalidation count, DB refresh/checker/current-files signature).
+
+    Changes whenever data derived from current files may be stale; the DB
+    part is None when it cannot be read, in which case nothing should be cached.
+    """
+    return _CACHE_GENERATION, _db_signature()
+
+
+def current_files_signature() -> Optional[Tuple[int, Optional[int], Optional[datetime]]]:
+    """(count, max id, max ingested_at) over current files, read uncached.
+
+    Admin deletes, replacements and tile ingests only call invalidate_caches()
+    in the worker that served them; this is the state every worker can see.
+    None when it cannot be read.
+    """
+    try:
+        with get_session() as s:
+            return _current_files_stamp(s)
     except Exception:
         return None
 
 
 def invalidate_caches() -> None:
-    global _TILES_CACHE, _COMMENTS_CACHE, _STATS_CACHE, _CATEGORIES_CACHE, _BENEFICIARIES_CACHE, _RULES_CACHE, _CITY_SLUG_CACHE
+    global _TILES_CACHE, _COMMENTS_CACHE, _STATS_CACHE, _CATEGORIES_CACHE, _BENEFICIARIES_CACHE, _RULES_CACHE, _CITY_SLUG_CACHE, _CURRENT_FILE_COUNT_CACHE, _CACHE_GENERATION, _DB_SIGNATURE_CACHE
+    _CACHE_GENERATION += 1
     _TILES_CACHE = None
     _COMMENTS_CACHE = None
     _STATS_CACHE = None
@@ -446,6 +515,21 @@ def invalidate_caches() -> None:
     _BENEFICIARIES_CACHE = None
     _RULES_CACHE = None
     _CITY_SLUG_CACHE = None
+    _CURRENT_FILE_COUNT_CACHE = None
+    _DB_SIGNATURE_CACHE = None
+
+
+def count_current_files() -> int:
+    """Number of current PB files, cached for a short TTL."""
+    global _CURRENT_FILE_COUNT_CACHE
+    cached = _CURRENT_FILE_COUNT_CACHE
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _CURRENT_FILE_COUNT_TTL:
+        return cached[1]
+    with get_session() as s:
+        count = s.query(PBFile).filter(PBFile.is_current == True).count()  # noqa: E712
+    _CURRENT_FILE_COUNT_CACHE = (now, count)
+    return count
 
 
 def _row_to_tile(
@@ -1185,14 +1269,20 @@ def get_filter_availability(
 
 
 def get_tiles_cached() -> List[Dict[str, Any]]:
-    global _TILES_CACHE
-    import time
     t0 = time.time()
     db_sig = _db_signature()
-    if _TILES_CACHE is not None and getattr(_TILES_CACHE, "_db_sig", None) == db_sig:
+    if _TILES_CACHE is not None and _CACHE_SIGS.get("tiles") == db_sig:
         _logger.debug("get_tiles_cached hit cache (%d tiles) in %.4fs", len(_TILES_CACHE), time.time() - t0)
         return _TILES_CACHE
+    with _CACHE_LOCKS["tiles"]:
+        # Rebuilt by another request while this one waited
+        if _TILES_CACHE is not None and _CACHE_SIGS.get("tiles") == db_sig:
+            return _TILES_CACHE
+        return _build_tiles(db_sig, t0)
 
+
+def _build_tiles(db_sig: Optional[str], t0: float) -> List[Dict[str, Any]]:
+    global _TILES_CACHE, _TILES_BY_ID
     _logger.debug("get_tiles_cached MISS — rebuilding")
     t1 = time.time()
     with get_session() as s:
@@ -1262,14 +1352,32 @@ def get_tiles_cached() -> List[Dict[str, Any]]:
         comments_map[fid].append(text)
 
     tiles: List[Dict[str, Any]] = []
+    by_id: Dict[int, Tuple[Tuple[Any, ...], List[str], Dict[str, Any]]] = {}
+    reused = 0
     for r in rows:
-        tiles.append(_row_to_tile(r, comments_map))
+        values = tuple(r)
+        file_id = values[0]
+        comments = comments_map.get(file_id, [])
+        prev = _TILES_BY_ID.get(file_id)
+        if (
+            prev is not None
+            and prev[0] == values
+            and prev[1] == comments
+            # is_new also depends on today's date
+            and prev[2]["is_new"]
+            == compute_is_new_value(r.first_ingested_at or r.ingested_at)
+        ):
+            tile = prev[2]
+            reused += 1
+        else:
+            tile = _row_to_tile(r, comments_map)
+        by_id[file_id] = (values, comments, tile)
+        tiles.append(tile)
 
-    try:
-        setattr(tiles, "_db_sig", db_sig)
-    except Exception:
-        pass
+    _TILES_BY_ID = by_id
+    _logger.debug("get_tiles_cached reused %d of %d tiles", reused, len(tiles))
     _TILES_CACHE = tiles
+    _CACHE_SIGS["tiles"] = db_sig
     _logger.debug("get_tiles_cached rebuilt in %.4fs (total %.4fs)", time.time() - t1, time.time() - t0)
     return _TILES_CACHE
 
@@ -1281,14 +1389,29 @@ def aggregate_comments_cached() -> Tuple[
     Dict[str, List[Dict[str, Any]]],
     Dict[str, List[Dict[str, Any]]],
 ]:
-    global _COMMENTS_CACHE
     db_sig = _db_signature()
     if (
         _COMMENTS_CACHE is not None
-        and getattr(_COMMENTS_CACHE, "_db_sig", None) == db_sig
+        and _CACHE_SIGS.get("comments") == db_sig
     ):
         return _COMMENTS_CACHE
+    with _CACHE_LOCKS["comments"]:
+        if (
+            _COMMENTS_CACHE is not None
+            and _CACHE_SIGS.get("comments") == db_sig
+        ):
+            return _COMMENTS_CACHE
+        return _build_comments_aggregate(db_sig)
+
 
+def _build_comments_aggregate(db_sig: Optional[str]) -> Tuple[
+    Dict[str, List[str]],
+    List[Tuple[str, int, List[str]]],
+    Dict[str, List[Dict[str, Any]]],
+    Dict[str, List[Dict[str, Any]]],
+    Dict[str, List[Dict[str, Any]]],
+]:
+    global _COMMENTS_CACHE
     with get_session() as s:
         q = (
             s.query(
@@ -1304,40 +1427,69 @@ def aggregate_comments_cached() -> Tuple[
         )
         rows = q.all()
 
+    prev = _AGGREGATE_SOURCES.get("comments")
+    if prev is not None and prev[0] == rows:
+        _COMMENTS_CACHE = prev[1]
+        _CACHE_SIGS["comments"] = db_sig
+        return _COMMENTS_CACHE
+
     mapping: Dict[str, List[str]] = {}
     groups_temp_country: Dict[str, Dict[str, Dict[str, Any]]] = {}
     groups_temp_country_unit: Dict[str, Dict[str, Dict[str, Any]]] = {}
     groups_temp_country_unit_instance: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
+    # Group keys and labels depend only on the file's location, which repeats
+    # for every comment of the file: compute them once per location. Each
+    # entry is (key, label) per level, or None where the level does not apply.
+    loc_keys: Dict[Tuple[str, str, str], Tuple[Any, Any, Any]] = {}
+    levels = (
+        groups_temp_country,
+        groups_temp_country_unit,
+        groups_temp_country_unit_instance,
+    )
+
     for ctext, fname, country, unit, instance in rows:
         c = (ctext or "").strip()
-        country = (country or "").strip()
-        unit = (unit or "").strip()
-        instance = (instance or "").strip()
         if not c:
             continue
-        mapping.setdefault(c, []).append(fname)
-        if country:
-            cm_c = groups_temp_country.setdefault(c, {})
-            key_c = country.lower()
-            bucket_c = cm_c.setdefault(key_c, {"label": country, "files": []})
-            bucket_c["files"].append(fname)
-        if country or unit:
-            cm_cu = groups_temp_country_unit.setdefault(c, {})
-            key_cu = f"{country.lower()}::{unit.lower()}"
-            label_cu = f"{country} – {unit}".strip(" –") if (country or unit) else "—"
-            bucket_cu = cm_cu.setdefault(key_cu, {"label": label_cu, "files": []})
-            bucket_cu["files"].append(fname)
-        if country or unit or instance:
-            cm_cui = groups_temp_country_unit_instance.setdefault(c, {})
-            key_cui = f"{country.lower()}::{unit.lower()}::{instance.lower()}"
-            label_cui = (
-                f"{country} – {unit} – {instance}".strip(" –")
+        flist = mapping.get(c)
+        if flist is None:
+            mapping[c] = [fname]
+        else:
+            flist.append(fname)
+        loc = (country, unit, instance)
+        keys = loc_keys.get(loc)
+        if keys is None:
+            country = (country or "").strip()
+            unit = (unit or "").strip()
+            instance = (instance or "").strip()
+            country_lc, unit_lc = country.lower(), unit.lower()
+            keys = loc_keys[loc] = (
+                (country_lc, country) if country else None,
+                (
+                    f"{country_lc}::{unit_lc}",
+                    f"{country} – {unit}".strip(" –"),
+                )
+                if (country or unit)
+                else None,
+                (
+                    f"{country_lc}::{unit_lc}::{instance.lower()}",
+                    f"{country} – {unit} – {instance}".strip(" –"),
+                )
                 if (country or unit or instance)
-                else "—"
+                else None,
             )
-            bucket_cui = cm_cui.setdefault(key_cui, {"label": label_cui, "files": []})
-            bucket_cui["files"].append(fname)
+        for groups, key_label in zip(levels, keys):
+            if key_label is None:
+                continue
+            by_key = groups.get(c)
+            if by_key is None:
+                by_key = groups[c] = {}
+            bucket = by_key.get(key_label[0])
+            if bucket is None:
+                by_key[key_label[0]] = {"label": key_label[1], "files": [fname]}
+            else:
+                bucket["files"].append(fname)
 
     rows_list: List[Tuple[str, int, List[str]]] = []
     for c, flist in mapping.items():
@@ -1372,10 +1524,8 @@ def aggregate_comments_cached() -> Tuple[
         finalize_groups(groups_temp_country_unit),
         finalize_groups(groups_temp_country_unit_instance),
     )
-    try:
-        setattr(_COMMENTS_CACHE, "_db_sig", db_sig)  # type: ignore[attr-defined]
-    except Exception:
-        pass
+    _CACHE_SIGS["comments"] = db_sig
+    _AGGREGATE_SOURCES["comments"] = (rows, _COMMENTS_CACHE)
     return _COMMENTS_CACHE
 
 
@@ -1393,13 +1543,28 @@ def _aggregate_label_cached(
     kind: 'category' or 'beneficiary'
     Returns same tuple shape as aggregate_comments_cached.
     """
-    global _CATEGORIES_CACHE, _BENEFICIARIES_CACHE
-    table = PBCategory if kind == "category" else PBBeneficiary
-    global_cache = _CATEGORIES_CACHE if kind == "category" else _BENEFICIARIES_CACHE
     db_sig = _db_signature()
-    if global_cache is not None and getattr(global_cache, "_db_sig", None) == db_sig:
+    global_cache = _CATEGORIES_CACHE if kind == "category" else _BENEFICIARIES_CACHE
+    if global_cache is not None and _CACHE_SIGS.get(kind) == db_sig:
         return global_cache
+    with _CACHE_LOCKS[kind]:
+        global_cache = (
+            _CATEGORIES_CACHE if kind == "category" else _BENEFICIARIES_CACHE
+        )
+        if global_cache is not None and _CACHE_SIGS.get(kind) == db_sig:
+            return global_cache
+        return _build_label_aggregate(kind, db_sig)
 
+
+def _build_label_aggregate(kind: str, db_sig: Optional[str]) -> Tuple[
+    Dict[str, List[str]],
+    List[Tuple[str, int, List[str]]],
+    Dict[str, List[Dict[str, Any]]],
+    Dict[str, List[Dict[str, Any]]],
+    Dict[str, List[Dict[str, Any]]],
+]:
+    global _CATEGORIES_CACHE, _BENEFICIARIES_CACHE
+    table = PBCategory if kind == "category" else PBBeneficiary
     with get_session() as s:
         q = (
             s.query(
@@ -1489,10 +1654,7 @@ def _aggregate_label_cached(
         finalize_groups(groups_temp_country_unit),
         finalize_groups(groups_temp_country_unit_instance),
     )
-    try:
-        setattr(result, "_db_sig", db_sig)  # type: ignore[attr-defined]
-    except Exception:
-        pass
+    _CACHE_SIGS[kind] = db_sig
     if kind == "category":
         _CATEGORIES_CACHE = result
         return _CATEGORIES_CACHE
@@ -1533,11 +1695,23 @@ def aggregate_rules_cached() -> Tuple[
     For common rules like 'greedy', show location summaries instead of all files.
     Returns same tuple shape as aggregate_categories_cached.
     """
-    global _RULES_CACHE
     db_sig = _db_signature()
-    if _RULES_CACHE is not None and getattr(_RULES_CACHE, "_db_sig", None) == db_sig:
+    if _RULES_CACHE is not None and _CACHE_SIGS.get("rules") == db_sig:
         return _RULES_CACHE
+    with _CACHE_LOCKS["rules"]:
+        if _RULES_CACHE is not None and _CACHE_SIGS.get("rules") == db_sig:
+            return _RULES_CACHE
+        return _build_rules_aggregate(db_sig)
 
+
+def _build_rules_aggregate(db_sig: Optional[str]) -> Tuple[
+    Dict[str, List[str]],
+    List[Tuple[str, int, List[str]]],
+    Dict[str, List[Dict[str, Any]]],
+    Dict[str, List[Dict[str, Any]]],
+    Dict[str, List[Dict[str, Any]]],
+]:
+    global _RULES_CACHE
     with get_session() as s:
         q = s.query(
             PBFile.rule_raw,
@@ -1626,101 +1800,119 @@ def aggregate_rules_cached() -> Tuple[
         finalize_groups(groups_temp_country_unit),
         finalize_groups(groups_temp_country_unit_instance),
     )
-    try:
-        setattr(result, "_db_sig", db_sig)  # type: ignore[attr-defined]
-    except Exception:
-        pass
     _RULES_CACHE = result
+    _CACHE_SIGS["rules"] = db_sig
     return _RULES_CACHE
 
 
 def aggregate_statistics_cached() -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    global _STATS_CACHE
     db_sig = _db_signature()
-    if _STATS_CACHE is not None and getattr(_STATS_CACHE, "_db_sig", None) == db_sig:
+    if _STATS_CACHE is not None and _CACHE_SIGS.get("stats") == db_sig:
         return _STATS_CACHE
+    with _CACHE_LOCKS["stats"]:
+        if _STATS_CACHE is not None and _CACHE_SIGS.get("stats") == db_sig:
+            return _STATS_CACHE
+        return _build_statistics_aggregate(db_sig)
+
 
+def _build_statistics_aggregate(
+    db_sig: Optional[str],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    global _STATS_CACHE
     with get_session() as s:
-        q = s.query(PBFile)
-        if _sa_load_only:
-            q = q.options(
-                _sa_load_only(
-                    PBFile.country,
-                    PBFile.unit,
-                    PBFile.year,
-                    PBFile.num_projects,
-                    PBFile.num_votes,
-                    PBFile.num_selected_projects,
-                    PBFile.budget,
-                    PBFile.currency,
-                    PBFile.vote_type,
-                )
+        # Plain column tuples: no ORM objects to hydrate and track per file
+        rows = (
+            s.query(
+                PBFile.country,
+                PBFile.unit,
+                PBFile.year,
+                PBFile.num_projects,
+                PBFile.num_votes,
+                PBFile.num_selected_projects,
+                PBFile.budget,
+                PBFile.currency,
+                PBFile.vote_type,
             )
-        pb_files: List[PBFile] = q.filter(PBFile.is_current == True).all()  # noqa: E712
-
-        # Process data while still within the session context
-        total_files = len(pb_files)
-        countries = set()
-        cities = set()
-        sum_projects = 0
-        sum_votes = 0
-        sum_selected = 0
-        sum_budget = 0
-        budget_by_currency_total: Dict[str, int] = {}
-
-        by_year: Dict[str, int] = {}
-        votes_by_country: Dict[str, int] = {}
-        budget_by_country: Dict[str, int] = {}
-        budget_by_country_by_currency: Dict[str, Dict[str, int]] = {}
-        vote_types: Dict[str, int] = {}
-        votes_by_city: Dict[str, int] = {}
-        votes_projects_scatter: List[Dict[str, Any]] = []
-
-        for r in pb_files:
-            country = r.country or ""
-            city = r.unit or ""
-            year = r.year
-            num_projects = int(r.num_projects or 0)
-            num_votes = int(r.num_votes or 0)
-            num_selected = int(r.num_selected_projects or 0)
-            budget = r.budget
-            currency = (r.currency or "").strip() or "—"
-            vtype = (r.vote_type or "").strip().lower() or "unknown"
-
-            if country:
-                countries.add(country)
-            if country or city:
-                cities.add((country, city))
-
-            sum_projects += num_projects
-            sum_votes += num_votes
-            sum_selected += num_selected
-
-            if num_projects or num_votes:
-                city_label = f"{city}, {country}".strip(", ")
-                votes_projects_scatter.append(
-                    {"x": num_projects, "y": num_votes, "label": city_label or "—"}
-                )
+            .filter(PBFile.is_current == True)  # noqa: E712
+            .all()
+        )
+
+    prev = _AGGREGATE_SOURCES.get("stats")
+    if prev is not None and prev[0] == rows:
+        _STATS_CACHE = prev[1]
+        _CACHE_SIGS["stats"] = db_sig
+        return _STATS_CACHE
+
+    total_files = len(rows)
+    countries = set()
+    cities = set()
+    sum_projects = 0
+    sum_votes = 0
+    sum_selected = 0
+    sum_budget = 0
+    budget_by_currency_total: Dict[str, int] = {}
+
+    by_year: Dict[str, int] = Counter()
+    votes_by_country: Dict[str, int] = {}
+    budget_by_country: Dict[str, int] = {}
+    budget_by_country_by_currency: Dict[str, Dict[str, int]] = {}
+    vote_types: Dict[str, int] = Counter()
+    votes_by_city: Dict[str, int] = {}
+    votes_projects_scatter: List[Dict[str, Any]] = []
+
+    for (
+        country,
+        city,
+        year,
+        num_projects,
+        num_votes,
+        num_selected,
+        budget,
+        currency,
+        vtype,
+    ) in rows:
+        country = country or ""
+        city = city or ""
+        num_projects = int(num_projects or 0)
+        num_votes = int(num_votes or 0)
+        num_selected = int(num_selected or 0)
+        currency = (currency or "").strip() or "—"
+        vtype = (vtype or "").strip().lower() or "unknown"
+
+        if country:
+            countries.add(country)
+        if country or city:
+            cities.add((country, city))
+
+        sum_projects += num_projects
+        sum_votes += num_votes
+        sum_selected += num_selected
+
+        if num_projects or num_votes:
+            city_label = f"{city}, {country}".strip(", ")
+            votes_projects_scatter.append(
+                {"x": num_projects, "y": num_votes, "label": city_label or "—"}
+            )
+        if isinstance(budget, int):
+            sum_budget += budget
+            budget_by_currency_total[currency] = (
+                budget_by_currency_total.get(currency, 0) + budget
+            )
+
+        if year is not None:
+            by_year[str(year)] += 1
+        if country:
+            votes_by_country[country] = votes_by_country.get(country, 0) + num_votes
             if isinstance(budget, int):
-                sum_budget += budget
-                budget_by_currency_total[currency] = (
-                    budget_by_currency_total.get(currency, 0) + budget
+                budget_by_country[country] = (
+                    budget_by_country.get(country, 0) + budget
                 )
+                by_cur = budget_by_country_by_currency.setdefault(currency, {})
+                by_cur[country] = by_cur.get(country, 0) + budget
+        vote_types[vtype] += 1
 
-            if year is not None:
-                by_year[str(year)] = by_year.get(str(year), 0) + 1
-            if country:
-                votes_by_country[country] = votes_by_country.get(country, 0) + num_votes
-                if isinstance(budget, int):
-                    budget_by_country[country] = (
-                        budget_by_country.get(country, 0) + budget
-                    )
-                    by_cur = budget_by_country_by_currency.setdefault(currency, {})
-                    by_cur[country] = by_cur.get(country, 0) + budget
-            vote_types[vtype] = vote_types.get(vtype, 0) + 1
-
-            label = f"{country} – {city}".strip(" –")
-            votes_by_city[label] = votes_by_city.get(label, 0) + num_votes
+        label = f"{country} – {city}".strip(" –")
+        votes_by_city[label] = votes_by_city.get(label, 0) + num_votes
 
     # Process results after session closes
     totals: Dict[str, Any] = {
@@ -1768,19 +1960,16 @@ def aggregate_statistics_cached() -> Tuple[Dict[str, Any], Dict[str, Any]]:
             key=lambda d: d["value"],
             reverse=True,
         ),
-        "top_cities_by_votes": sorted(
-            [{"label": k, "value": v} for k, v in votes_by_city.items()],
-            key=lambda d: d["value"],
-            reverse=True,
-        )[:15],
+        "top_cities_by_votes": [
+            {"label": k, "value": v}
+            for k, v in heapq.nlargest(15, votes_by_city.items(), key=itemgetter(1))
+        ],
         "votes_projects_scatter": votes_projects_scatter,
     }
 
     _STATS_CACHE = (totals, series)
-    try:
-        setattr(_STATS_CACHE, "_db_sig", db_sig)  # type: ignore[attr-defined]
-    except Exception:
-        pass
+    _CACHE_SIGS["stats"] = db_sig
+    _AGGREGATE_SOURCES["stats"] = (rows, _STATS_CACHE)
     return _STATS_CACHE
 
 
@@ -1824,11 +2013,23 @@ def get_all_current_file_paths() -> List[Tuple[str, Path]]:
                 .all()
             )
 
+            # One scandir per directory instead of two stat() calls per file:
+            # DirEntry.is_file() is answered from the listing's d_type
+            listed: Dict[str, set] = {}
             result = []
             for file_name, path_str in rows:
                 if path_str:
                     path = Path(path_str)
-                    if path.exists() and path.is_file():
+                    parent = str(path.parent)
+                    names = listed.get(parent)
+                    if names is None:
+                        try:
+                            with os.scandir(parent) as it:
+                                names = {e.name for e in it if e.is_file()}
+                        except OSError:
+                            names = set()
+                        listed[parent] = names
+                    if path.name in names:
                         result.append((file_name, path))
             return result
     except Exception:
@@ -12,7 +12,7 @@ from typing import Any, Dict, List
 from sqlalchemy.orm import Session
 
 from ..models import PBFile, PBRuleComparison
-from ..utils.load_pb_file import parse_pb_lines
+from ..utils.pb_utils import parse_pb_file_cached
 
 
 SUPPORTED_ALTERNATIVE_RULES = {"equalshares/add1-comparison"}
@@ -103,10 +103,9 @@ def _find_stable_cached_comparison(
 def _compute_rule_comparison(
     filename: str, file_path: Path, alternative_rule: str
 ) -> Dict[str, Any]:
-    with file_path.open("r", encoding="utf-8", newline="") as f:
-        lines = [line.rstrip("\n") for line in f]
-
-    meta, projects, votes, _votes_in_projects, _scores_in_projects = parse_pb_lines(lines)
+    meta, projects, votes, _votes_in_projects, _scores_in_projects = parse_pb_file_cached(
+        file_path
+    )
 
     current_rule = str(meta.get("rule") or "unknown").strip() or "unknown"
     vote_type = str(meta.get("vote_type") or "").strip().lower()
@@ -4,10 +4,12 @@ import hashlib
 import io
 import json
 import secrets
+import time
 import zipfile
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..utils.zip_utils import iter_zip as _zip_iter
 
 # NOTE: This is the canonical list of user-facing download filters that we persist
 # into snapshot context and render inside `_PERMANENT_DOWNLOAD_LINK.txt`.
@@ -176,7 +178,7 @@ def create_link_text_file(
 ) -> str:
     """Create text file content with permanent download link."""
     snapshot_url = build_snapshot_url(snapshot_id, base_url, context_id=context_id)
-    timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
     filter_lines = "\n".join(format_filter_context_lines(filters))
 
     content = f"""Permanent Download Link
@@ -432,8 +434,13 @@ def create_download_with_link(
     download_name: str,
     base_url: str,
     filters: Optional[Dict[str, Any]] = None,
-) -> tuple[io.BytesIO, str, Optional[str]]:
-    """Create a ZIP download with files and permanent link text file."""
+    compress_type: int = zipfile.ZIP_DEFLATED,
+) -> tuple[Iterator[bytes], str, Optional[str]]:
+    """Create a ZIP download with files and permanent link text file.
+
+    The snapshot is recorded up front; the archive itself is returned as a
+    chunk iterator for a streaming response rather than built in memory.
+    """
     # Create snapshot first
     snapshot_id = create_download_snapshot(
         file_pairs=file_pairs, download_name=download_name
@@ -442,27 +449,23 @@ def create_download_with_link(
         snapshot_id=snapshot_id, download_name=download_name, filters=filters
     )
 
-    # Create ZIP in memory with files + link
-    memory_file = io.BytesIO()
-    with zipfile.ZipFile(memory_file, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        # Add all the actual files
-        for name, path in file_pairs:
-            if path.exists():
-                zf.write(path, arcname=name)
-
-        # Add the permanent link text file
-        link_content = create_link_text_file(
-            snapshot_id,
-            download_name,
-            base_url,
-            filters=filters,
-            context_id=context_id,
-            file_count=len(file_pairs),
-        )
-        zf.writestr("_PERMANENT_DOWNLOAD_LINK.txt", link_content.encode("utf-8"))
-
-    memory_file.seek(0)
-    return memory_file, snapshot_id, context_id
+    link_content = create_link_text_file(
+        snapshot_id,
+        download_name,
+        base_url,
+        filters=filters,
+        context_id=context_id,
+        file_count=len(file_pairs),
+    )
+    # Files + the permanent link text file, appended last
+    chunks = _zip_iter(
+        [(name, path) for name, path in file_pairs if path.exists()],
+        extra_members=[
+            ("_PERMANENT_DOWNLOAD_LINK.txt", link_content.encode("utf-8"))
+        ],
+        compress_type=compress_type,
+    )
+    return chunks, snapshot_id, context_id
 
 
 def add_link_to_existing_zip(
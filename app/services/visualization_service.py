@@ -1,18 +1,28 @@
 """
 Service for computing and caching visualization data for PB files.
 """
+import heapq
 import json
-import statistics
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 import numpy as np
-from sklearn.manifold import MDS
 from sqlalchemy.orm import Session
 
 from ..models import PBFile, PBVisualization
-from ..utils.load_pb_file import parse_pb_lines
+from ..utils.pb_utils import parse_pb_file_cached
+
+_logger = logging.getLogger(__name__)
+
+# Stored with each PBVisualization row; bump when the computed data changes
+# so rows built by older code are recomputed even if their file did not change.
+# 2: correlation_data holds only the real cost/popularity value.
+VISUALIZATION_SCHEMA = 2
 
 
 def get_or_compute_visualization_data(
@@ -35,14 +45,15 @@ def get_or_compute_visualization_data(
     cached = session.query(PBVisualization).filter_by(file_id=file_id).first()
     
     if cached:
-        # Check if cache is still valid
+        # Check if cache is still valid for this file version and data schema
         if cached.file_mtime == file_mtime:
-            # Cache is fresh, return it
-            return json.loads(cached.data)
-        else:
-            # Cache is stale, delete it
-            session.delete(cached)
-            session.commit()
+            data = json.loads(cached.data)
+            if data.get("schema") == VISUALIZATION_SCHEMA:
+                # Cache is fresh, return it
+                return data
+        # Cache is stale, delete it
+        session.delete(cached)
+        session.commit()
     
     # Compute visualization data
     viz_data = _compute_visualization_data(filename, file_path)
@@ -66,14 +77,12 @@ def _compute_visualization_data(filename: str, path: Path) -> Dict[str, Any]:
     
     Returns a dictionary with all chart data and statistics.
     """
-    # Parse file
-    with path.open("r", encoding="utf-8", newline="") as f:
-        lines = [line.rstrip("\n") for line in f]
-    
-    meta, projects, votes, votes_in_projects, scores_in_projects = parse_pb_lines(lines)
+    # Parse file (shared with the preview page while the file is unchanged)
+    meta, projects, votes, votes_in_projects, scores_in_projects = parse_pb_file_cached(path)
     
     # Initialize result dictionary
     result = {
+        "schema": VISUALIZATION_SCHEMA,
         "filename": filename,
         "counts": {
             "projects": len(projects),
@@ -81,53 +90,52 @@ def _compute_visualization_data(filename: str, path: Path) -> Dict[str, Any]:
         },
     }
     
-    # Project costs for histogram
-    project_costs = [
-        float(proj.get("cost", 0)) for proj in projects.values() if proj.get("cost")
-    ]
-    
-    # Vote processing
-    vote_counts_per_project = {}
-    vote_lengths = []
-    voters_per_project = {}  # project_id -> set of voter_ids
-    
-    for vote_id, vote_data in votes.items():
-        vote_list = vote_data.get("vote")
-        if vote_list is None:
-            continue
-        
-        voted_projects = _parse_vote_list(vote_list)
-        
-        if voted_projects:
-            vote_lengths.append(len(voted_projects))
-            
-            for pid in voted_projects:
-                pid_str = str(pid).strip()
-                if pid_str:
-                    vote_counts_per_project[pid_str] = vote_counts_per_project.get(pid_str, 0) + 1
-                    if pid_str not in voters_per_project:
-                        voters_per_project[pid_str] = set()
-                    voters_per_project[pid_str].add(vote_id)
-    
+    # One pass over votes and one over projects feed all chart builders
+    vote_scan = _scan_votes(votes)
+    project_scan = _scan_projects(projects)
+    vote_counts_per_project = vote_scan.counts_per_project
+    project_costs = project_scan.costs
+    cost_arr = np.asarray(project_costs, dtype=np.float64)
+    cost_votes_arr = np.fromiter(
+        (vote_counts_per_project.get(pid, 0) for pid in project_scan.cost_pids),
+        dtype=np.int64,
+        count=len(project_scan.cost_pids),
+    )
+    approvals_arr = np.fromiter(
+        vote_counts_per_project.values(),
+        dtype=np.int64,
+        count=len(vote_counts_per_project),
+    )
+
     # Build visualization components
-    result["project_data"] = _build_project_data(projects, project_costs, vote_counts_per_project)
+    result["project_data"] = _build_project_data(project_costs, cost_arr, cost_votes_arr)
     result["vote_data"] = _build_vote_data(vote_counts_per_project)
-    result["vote_length_data"] = _build_vote_length_data(vote_lengths)
+    result["vote_length_data"] = _build_vote_length_data(vote_scan.lengths)
     result["top_projects_data"] = _build_top_projects_data(projects, vote_counts_per_project)
-    result["approval_histogram_data"] = _build_approval_histogram(vote_counts_per_project)
-    result["selection_data"] = _build_selection_data(projects, vote_counts_per_project)
-    result["category_data"] = _build_category_data(projects)
-    result["demographic_data"] = _build_demographic_data(votes)
-    result["category_cost_data"] = _build_category_cost_data(projects)
+    result["approval_histogram_data"] = _build_approval_histogram(approvals_arr)
+    result["selection_data"] = _build_selection_data(
+        project_scan.selected_ids,
+        project_scan.cost_pids,
+        result["project_data"]["scatter_data"],
+    )
+    result["category_data"] = _build_category_data(project_scan)
+    result["demographic_data"] = _build_demographic_data(vote_scan)
+    result["category_cost_data"] = _build_category_cost_data(project_scan)
     result["timeline_data"] = _build_timeline_data(votes)
     result["summary_stats"] = _build_summary_stats(
-        votes, projects, vote_lengths, project_costs, vote_counts_per_project
+        votes, projects, project_scan, vote_scan, cost_arr, approvals_arr
+    )
+    result["correlation_data"] = _build_correlation_data(
+        project_costs, vote_counts_per_project, cost_arr, cost_votes_arr
     )
-    result["correlation_data"] = _build_correlation_data(projects, vote_counts_per_project, project_costs)
     
     # Project similarity (MDS) - skip for very large datasets
     result["project_similarity_data"] = _build_project_similarity_data(
-        projects, vote_counts_per_project, voters_per_project, project_costs
+        projects,
+        vote_counts_per_project,
+        vote_scan.voters_per_project,
+        project_costs,
+        project_scan.selected_ids,
     )
     
     # Flags for template
@@ -137,6 +145,131 @@ def _compute_visualization_data(filename: str, path: Path) -> Dict[str, Any]:
     return result
 
 
+@dataclass
+class _VoteScan:
+    """Per-vote aggregates collected in a single pass over VOTES."""
+
+    counts_per_project: Dict[str, int] = field(default_factory=Counter)
+    voters_per_project: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
+    lengths: List[int] = field(default_factory=list)
+    length_sum: int = 0
+    age_counts: Dict[str, int] = field(default_factory=Counter)
+    sex_counts: Dict[str, int] = field(default_factory=Counter)
+
+
+@dataclass
+class _ProjectScan:
+    """Per-project aggregates collected in a single pass over PROJECTS."""
+
+    costs: List[float] = field(default_factory=list)
+    cost_pids: List[str] = field(default_factory=list)
+    selected_ids: Set[str] = field(default_factory=set)
+    summary_selected: int = 0
+    has_category: bool = False
+    category_counts: Dict[str, int] = field(default_factory=Counter)
+    category_cost_sum: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    category_cost_n: Dict[str, int] = field(default_factory=Counter)
+
+
+_SELECTED_TRUE = {"1", "true", "yes", "y"}
+_SUMMARY_SELECTED_VALUES = {"1", "true", "yes", "y", True, 1}
+
+
+def _age_group(age: Any) -> Optional[str]:
+    try:
+        age_int = int(age)
+    except (ValueError, TypeError):
+        return None
+    if age_int < 18:
+        return "Under 18"
+    if age_int < 30:
+        return "18-29"
+    if age_int < 45:
+        return "30-44"
+    if age_int < 65:
+        return "45-64"
+    return "65+"
+
+
+def _scan_votes(votes: Dict) -> _VoteScan:
+    """Collect approval counts, voter sets, ballot lengths and demographics."""
+    scan = _VoteScan()
+    counts = scan.counts_per_project
+    voters = scan.voters_per_project
+    lengths = scan.lengths
+    # Ages and sexes repeat across voters: tally raw values here and bucket
+    # each distinct value once afterwards
+    raw_ages: Dict[Any, int] = Counter()
+    raw_sexes: Dict[Any, int] = Counter()
+    for vote_id, vote_data in votes.items():
+        vote_list = vote_data.get("vote")
+        if vote_list is not None:
+            if type(vote_list) is list:
+                # parse_pb_file already yields stripped, non-empty IDs
+                voted_projects = vote_list
+            else:
+                voted_projects = _parse_vote_list(vote_list)
+            if voted_projects:
+                lengths.append(len(voted_projects))
+                counts.update(voted_projects)
+                for pid in voted_projects:
+                    voters[pid].add(vote_id)
+
+        age = vote_data.get("age")
+        if age is not None:
+            raw_ages[age] += 1
+        sex = vote_data.get("sex")
+        if sex:
+            raw_sexes[sex] += 1
+
+    for age, n in raw_ages.items():
+        group = _age_group(age)
+        if group is not None:
+            scan.age_counts[group] += n
+    for sex, n in raw_sexes.items():
+        sex_str = str(sex).upper()
+        if sex_str in ("M", "MALE"):
+            scan.sex_counts["Male"] += n
+        elif sex_str in ("F", "FEMALE"):
+            scan.sex_counts["Female"] += n
+    scan.length_sum = sum(lengths)
+    return scan
+
+
+def _scan_projects(projects: Dict) -> _ProjectScan:
+    """Collect costs, selection flags and category tallies."""
+    scan = _ProjectScan()
+    for pid, proj in projects.items():
+        cost = proj.get("cost")
+        cost_float: Optional[float] = None
+        if cost:
+            cost_float = float(cost)
+            scan.costs.append(cost_float)
+            scan.cost_pids.append(pid)
+
+        selected_val = proj.get("selected")
+        if isinstance(selected_val, str):
+            if selected_val.strip().lower() in _SELECTED_TRUE:
+                scan.selected_ids.add(pid)
+        elif selected_val:
+            scan.selected_ids.add(pid)
+        if selected_val in _SUMMARY_SELECTED_VALUES:
+            scan.summary_selected += 1
+
+        if "category" in proj:
+            scan.has_category = True
+        categories = proj.get("category", "")
+        if categories:
+            cats = [cat.strip() for cat in str(categories).split(",") if cat.strip()]
+            for cat in cats:
+                scan.category_counts[cat] += 1
+            if cost_float is not None:
+                for cat in cats:
+                    scan.category_cost_sum[cat] += cost_float
+                    scan.category_cost_n[cat] += 1
+    return scan
+
+
 def _parse_vote_list(vote_list: Any) -> List[str]:
     """Parse a vote list from various formats into a list of project IDs."""
     voted_projects = []
@@ -155,18 +288,12 @@ def _parse_vote_list(vote_list: Any) -> List[str]:
 
 
 def _build_project_data(
-    projects: Dict, project_costs: List[float], vote_counts_per_project: Dict
+    project_costs: List[float], cost_arr: np.ndarray, votes_arr: np.ndarray
 ) -> Dict[str, Any]:
     """Build project cost and scatter data."""
-    scatter_data = []
-    for pid, proj in projects.items():
-        cost = proj.get("cost")
-        votes_received = vote_counts_per_project.get(pid, 0)
-        if cost is not None:
-            try:
-                scatter_data.append({"x": float(cost), "y": votes_received})
-            except (ValueError, TypeError):
-                continue
+    scatter_data = [
+        {"x": x, "y": y} for x, y in zip(cost_arr.tolist(), votes_arr.tolist())
+    ]
     
     return {
         "costs": project_costs,
@@ -190,16 +317,11 @@ def _build_vote_length_data(vote_lengths: List[int]) -> Optional[Dict[str, Any]]
     if not vote_lengths:
         return None
     
-    vote_length_counts = {}
-    for length in vote_lengths:
-        vote_length_counts[length] = vote_length_counts.get(length, 0) + 1
-    
-    vote_length_counts = dict(sorted(vote_length_counts.items()))
-    sorted_lengths = sorted(vote_length_counts.keys())
+    lengths, counts = np.unique(np.asarray(vote_lengths, dtype=np.int64), return_counts=True)
     
     return {
-        "labels": [str(length) for length in sorted_lengths],
-        "counts": [vote_length_counts[length] for length in sorted_lengths],
+        "labels": [str(length) for length in lengths.tolist()],
+        "counts": counts.tolist(),
     }
 
 
@@ -210,9 +332,10 @@ def _build_top_projects_data(
     if not vote_counts_per_project:
         return None
     
-    sorted_projects = sorted(
-        vote_counts_per_project.items(), key=lambda x: x[1], reverse=True
-    )[:10]
+    # Same order as a full descending sort cut at 10, without sorting every project
+    sorted_projects = heapq.nlargest(
+        10, vote_counts_per_project.items(), key=itemgetter(1)
+    )
     
     project_names = []
     project_votes = []
@@ -227,54 +350,36 @@ def _build_top_projects_data(
     return {"labels": project_names, "votes": project_votes}
 
 
-def _build_approval_histogram(vote_counts_per_project: Dict) -> Optional[Dict[str, Any]]:
+def _build_approval_histogram(approvals_arr: np.ndarray) -> Optional[Dict[str, Any]]:
     """Build approval histogram (number of approvals per project)."""
-    if not vote_counts_per_project:
+    if not approvals_arr.size:
         return None
     
-    approval_counts = list(vote_counts_per_project.values())
-    approval_histogram = {}
-    for count in approval_counts:
-        approval_histogram[count] = approval_histogram.get(count, 0) + 1
-    
-    approval_histogram = dict(sorted(approval_histogram.items()))
+    approvals, counts = np.unique(approvals_arr, return_counts=True)
     
     return {
-        "labels": [str(k) for k in approval_histogram.keys()],
-        "counts": [approval_histogram[k] for k in approval_histogram.keys()],
+        "labels": [str(k) for k in approvals.tolist()],
+        "counts": counts.tolist(),
     }
 
 
 def _build_selection_data(
-    projects: Dict, vote_counts_per_project: Dict
+    selected_projects: Set[str],
+    cost_pids: List[str],
+    scatter_data: List[Dict[str, Any]],
 ) -> Optional[Dict[str, Any]]:
-    """Build project selection scatter (selected vs not selected)."""
-    selected_projects = set()
-    
-    for proj_id, proj in projects.items():
-        selected_val = proj.get("selected")
-        if isinstance(selected_val, str):
-            sv = selected_val.strip().lower()
-            if sv in {"1", "true", "yes", "y"}:
-                selected_projects.add(proj_id)
-        elif selected_val:
-            selected_projects.add(proj_id)
-    
+    """Build project selection scatter (selected vs not selected).
+
+    Partitions the cost/votes points already built for the project scatter.
+    """
     selected_points = []
     not_selected_points = []
     
-    for pid, proj in projects.items():
-        cost = proj.get("cost")
-        votes_received = vote_counts_per_project.get(pid, 0)
-        if cost is not None:
-            try:
-                point = {"x": float(cost), "y": votes_received}
-                if pid in selected_projects:
-                    selected_points.append(point)
-                else:
-                    not_selected_points.append(point)
-            except (ValueError, TypeError):
-                continue
+    for pid, point in zip(cost_pids, scatter_data):
+        if pid in selected_projects:
+            selected_points.append(point)
+        else:
+            not_selected_points.append(point)
     
     if selected_points or not_selected_points:
         return {
@@ -284,62 +389,23 @@ def _build_selection_data(
     return None
 
 
-def _build_category_data(projects: Dict) -> Optional[Dict[str, Any]]:
+def _build_category_data(scan: _ProjectScan) -> Optional[Dict[str, Any]]:
     """Build category distribution data."""
-    if not any("category" in proj for proj in projects.values()):
+    if not scan.has_category:
         return None
     
-    category_counts = {}
-    for proj in projects.values():
-        categories = proj.get("category", "")
-        if categories:
-            cats = [cat.strip() for cat in str(categories).split(",") if cat.strip()]
-            for cat in cats:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-    
-    if category_counts:
+    if scan.category_counts:
         return {
-            "labels": list(category_counts.keys()),
-            "counts": list(category_counts.values()),
+            "labels": list(scan.category_counts.keys()),
+            "counts": list(scan.category_counts.values()),
         }
     return None
 
 
-def _build_demographic_data(votes: Dict) -> Optional[Dict[str, Any]]:
+def _build_demographic_data(scan: _VoteScan) -> Optional[Dict[str, Any]]:
     """Build demographic distribution data."""
-    if not votes:
-        return None
-    
-    age_counts = {}
-    sex_counts = {}
-    
-    for vote_data in votes.values():
-        age = vote_data.get("age")
-        sex = vote_data.get("sex")
-        
-        if age is not None:
-            try:
-                age_int = int(age)
-                if age_int < 18:
-                    age_group = "Under 18"
-                elif age_int < 30:
-                    age_group = "18-29"
-                elif age_int < 45:
-                    age_group = "30-44"
-                elif age_int < 65:
-                    age_group = "45-64"
-                else:
-                    age_group = "65+"
-                age_counts[age_group] = age_counts.get(age_group, 0) + 1
-            except (ValueError, TypeError):
-                pass
-        
-        if sex:
-            sex_str = str(sex).upper()
-            if sex_str in ["M", "MALE"]:
-                sex_counts["Male"] = sex_counts.get("Male", 0) + 1
-            elif sex_str in ["F", "FEMALE"]:
-                sex_counts["Female"] = sex_counts.get("Female", 0) + 1
+    age_counts = scan.age_counts
+    sex_counts = scan.sex_counts
     
     if age_counts or sex_counts:
         demographic_data = {}
@@ -357,40 +423,21 @@ def _build_demographic_data(votes: Dict) -> Optional[Dict[str, Any]]:
     return None
 
 
-def _build_category_cost_data(projects: Dict) -> Optional[Dict[str, Any]]:
+def _build_category_cost_data(scan: _ProjectScan) -> Optional[Dict[str, Any]]:
     """Build category average cost data."""
-    if not any("category" in proj for proj in projects.values()):
+    if not scan.has_category:
         return None
     
-    category_costs = {}
-    category_counts_for_avg = {}
-    
-    for proj in projects.values():
-        categories = proj.get("category", "")
-        cost = proj.get("cost")
-        if categories and cost is not None:
-            try:
-                cost_float = float(cost)
-                cats = [cat.strip() for cat in str(categories).split(",") if cat.strip()]
-                for cat in cats:
-                    if cat not in category_costs:
-                        category_costs[cat] = 0
-                        category_counts_for_avg[cat] = 0
-                    category_costs[cat] += cost_float
-                    category_counts_for_avg[cat] += 1
-            except (ValueError, TypeError):
-                continue
+    labels = []
+    avg_costs = []
+    for cat, total in scan.category_cost_sum.items():
+        n = scan.category_cost_n[cat]
+        if n > 0:
+            labels.append(cat)
+            avg_costs.append(total / n)
     
-    if category_costs:
-        avg_costs = []
-        labels = []
-        for cat in category_costs:
-            if category_counts_for_avg[cat] > 0:
-                labels.append(cat)
-                avg_costs.append(category_costs[cat] / category_counts_for_avg[cat])
-        
-        if labels:
-            return {"labels": labels, "avg_costs": avg_costs}
+    if labels:
+        return {"labels": labels, "avg_costs": avg_costs}
     return None
 
 
@@ -416,68 +463,44 @@ def _build_timeline_data(votes: Dict) -> Optional[Dict[str, Any]]:
 def _build_summary_stats(
     votes: Dict,
     projects: Dict,
-    vote_lengths: List[int],
-    project_costs: List[float],
-    vote_counts_per_project: Dict,
+    scan: _ProjectScan,
+    vote_scan: _VoteScan,
+    cost_arr: np.ndarray,
+    approvals_arr: np.ndarray,
 ) -> Dict[str, Any]:
     """Build summary statistics."""
-    selected_projects = sum(
-        1
-        for proj in projects.values()
-        if proj.get("selected") in {"1", "true", "yes", "y", True, 1}
-    )
+    num_lengths = len(vote_scan.lengths)
     
     return {
         "total_voters": len(votes),
         "total_projects": len(projects),
-        "selected_projects": selected_projects,
-        "avg_vote_length": sum(vote_lengths) / len(vote_lengths) if vote_lengths else 0,
-        "total_budget": sum(project_costs) if project_costs else 0,
-        "avg_project_cost": sum(project_costs) / len(project_costs) if project_costs else 0,
+        "selected_projects": scan.summary_selected,
+        "avg_vote_length": vote_scan.length_sum / num_lengths if num_lengths else 0,
+        "total_budget": float(cost_arr.sum()) if cost_arr.size else 0,
+        "avg_project_cost": float(cost_arr.mean()) if cost_arr.size else 0,
         "most_popular_project_votes": (
-            max(vote_counts_per_project.values()) if vote_counts_per_project else 0
+            int(approvals_arr.max()) if approvals_arr.size else 0
         ),
     }
 
 
 def _build_correlation_data(
-    projects: Dict, vote_counts_per_project: Dict, project_costs: List[float]
+    project_costs: List[float],
+    vote_counts_per_project: Dict,
+    cost_arr: np.ndarray,
+    votes_arr: np.ndarray,
 ) -> Optional[Dict[str, Any]]:
     """Build simple correlation data."""
     if not project_costs or not vote_counts_per_project:
         return None
     
-    costs_for_corr = []
-    votes_for_corr = []
-    
-    for pid, proj in projects.items():
-        cost = proj.get("cost")
-        votes_received = vote_counts_per_project.get(pid, 0)
-        if cost is not None:
-            try:
-                costs_for_corr.append(float(cost))
-                votes_for_corr.append(votes_received)
-            except (ValueError, TypeError):
-                continue
-    
-    if len(costs_for_corr) <= 1:
+    if cost_arr.size <= 1:
         return None
     
-    mean_cost = statistics.mean(costs_for_corr)
-    mean_votes = statistics.mean(votes_for_corr)
-    
-    numerator = sum(
-        (c - mean_cost) * (v - mean_votes)
-        for c, v in zip(costs_for_corr, votes_for_corr)
-    )
-    sum_sq_cost = sum((c - mean_cost) ** 2 for c in costs_for_corr)
-    sum_sq_votes = sum((v - mean_votes) ** 2 for v in votes_for_corr)
-    
-    if sum_sq_cost > 0 and sum_sq_votes > 0:
-        correlation = numerator / (sum_sq_cost * sum_sq_votes) ** 0.5
-        correlations = [correlation, 0.1, -0.2, 0.3]  # Add dummy values
-        labels = ["Cost vs Popularity", "Budget vs Selection", "Category vs Votes", "Time vs Activity"]
-        return {"labels": labels, "values": correlations}
+    # Pearson's r is undefined when either series is constant
+    if cost_arr.std() > 0 and votes_arr.std() > 0:
+        correlation = float(np.corrcoef(cost_arr, votes_arr)[0, 1])
+        return {"labels": ["Cost vs Popularity"], "values": [correlation]}
     
     return None
 
@@ -487,6 +510,7 @@ def _build_project_similarity_data(
     vote_counts_per_project: Dict,
     voters_per_project: Dict,
     project_costs: List[float],
+    selected_projects: Set[str],
 ) -> List[Dict[str, Any]]:
     """
     Build project similarity scatter using Jaccard distances and MDS.
@@ -502,17 +526,6 @@ def _build_project_similarity_data(
     if n_projects < 2:
         return []
     
-    # Determine selected projects
-    selected_projects = set()
-    for proj_id, proj in projects.items():
-        selected_val = proj.get("selected")
-        if isinstance(selected_val, str):
-            sv = selected_val.strip().lower()
-            if sv in {"1", "true", "yes", "y"}:
-                selected_projects.add(proj_id)
-        elif selected_val:
-            selected_projects.add(proj_id)
-    
     try:
         # Calculate Jaccard distance matrix
         distance_matrix = np.zeros((n_projects, n_projects))
@@ -537,7 +550,9 @@ def _build_project_similarity_data(
                 distance_matrix[i, j] = jaccard_distance
                 distance_matrix[j, i] = jaccard_distance
         
-        # Use MDS to embed in 2D
+        # Use MDS to embed in 2D (sklearn is heavy; import only when needed)
+        from sklearn.manifold import MDS
+
         mds = MDS(n_components=2, dissimilarity='precomputed', random_state=42, normalized_stress='auto')
         coords_2d = mds.fit_transform(distance_matrix)
         
@@ -594,5 +609,5 @@ def _build_project_similarity_data(
     
     except Exception as e:
         # If MDS fails, return empty list
-        print(f"MDS computation failed: {e}")
+        _logger.warning("MDS computation failed: %s", e)
         return []
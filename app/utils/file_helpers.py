@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def workspace_root() -> Path:
-    # app/utils/file_helpers.py -> app -> repo root
+    # app/utils/file_helpers.py -> app -> repo root; resolved once per process
     return Path(__file__).resolve().parents[2]
 
 
@@ -12,6 +15,25 @@ def pb_folder() -> Path:
     return workspace_root() / "pb_files"
 
 
+def list_pb_files(folder: Path) -> list[Path]:
+    """Regular ``*.pb`` files directly in ``folder``, sorted by name.
+
+    A single ``os.scandir`` pass; hidden entries are skipped as with
+    ``glob("*.pb")``, and a missing folder yields an empty list.
+    """
+    try:
+        with os.scandir(folder) as it:
+            names = [
+                e.name
+                for e in it
+                if e.name.endswith(".pb") and not e.name.startswith(".") and e.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    names.sort()
+    return [folder / name for name in names]
+
+
 def is_safe_filename(name: str) -> bool:
     # basic safety for path traversal and extension
     return (
@@ -23,11 +45,6 @@ def is_safe_filename(name: str) -> bool:
     )
 
 
-def read_file_lines(path: Path) -> list[str]:
-    with path.open("r", encoding="utf-8", newline="") as f:
-        return [line.rstrip("\n") for line in f]
-
-
 def log(msg: str) -> None:
     try:
         print(f"[APP] {msg}", flush=True)
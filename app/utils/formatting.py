@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 
@@ -25,6 +26,9 @@ def format_short_number(n: float) -> str:
     return f"-{s}" if neg else s
 
 
+# Memoized: tile/summary rebuilds format the same counts over and over.
+# typed=True keeps 1 and 1.0 apart (some totals arrive as floats).
+@lru_cache(maxsize=4096, typed=True)
 def format_int(num: int) -> str:
     return f"{num:,}".replace(",", " ")
 
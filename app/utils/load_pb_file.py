@@ -1,6 +1,57 @@
 import csv
+import mmap
+import os
+import re
 from io import StringIO
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple, Union
+
+# Start of the VOTES section marker line (first cell is "votes", any case)
+_VOTES_MARKER = re.compile(rb"^[ \t\x0b\x0c]*votes[ \t\x0b\x0c]*(?:;|\r?$)", re.M | re.I)
+# Bytes the VOTES scan does not handle like csv/str.strip() would
+_SLOW_PATH_BYTES = (b'"', b"\x00", b"\x1c", b"\x1d", b"\x1e", b"\x1f")
+_SECTION_NAMES = (b"meta", b"projects", b"votes")
+_SECTION_ROW = re.compile(
+    rb"[ \t\x0b\x0c]*(?:meta|projects|votes)[ \t\x0b\x0c]*(?:;|\n|$)"
+)
+
+
+class PBPreview(NamedTuple):
+    """Full META/PROJECTS with only the first VOTES rows materialized."""
+
+    meta: Dict[str, str]
+    projects: Dict
+    votes: Dict
+    votes_in_projects: bool
+    scores_in_projects: bool
+    total_votes: int
+    vote_keys: Set[str]
+
+
+class PBSummary(NamedTuple):
+    """Full META/PROJECTS plus VOTES reduced to counts, for tile data."""
+
+    meta: Dict[str, str]
+    projects: Dict
+    votes_in_projects: bool
+    scores_in_projects: bool
+    num_votes: int
+    # Non-empty entries of the 'vote' column, summed over rows that have one
+    vote_length_sum: int
+    vote_length_count: int
+
+
+class _ParsedRows(NamedTuple):
+    meta: Dict[str, str]
+    projects: Dict
+    votes: Dict
+    votes_in_projects: bool
+    scores_in_projects: bool
+    # Vote rows past votes_limit: how many, the columns they would fill and
+    # their 'vote' lengths
+    skipped_votes: int
+    skipped_vote_keys: Set[str]
+    skipped_vote_length_sum: int
+    skipped_vote_length_count: int
 
 
 def parse_pb_lines(lines: List[str]) -> Tuple[Dict, Dict, Dict, bool, bool]:
@@ -8,17 +59,220 @@ def parse_pb_lines(lines: List[str]) -> Tuple[Dict, Dict, Dict, bool, bool]:
     Parses PB file lines where columns are divided by semicolon (';').
     Returns meta, projects, votes, votes_in_projects, scores_in_projects.
     """
-    meta: Dict = {}
+    # Use StringIO to simulate file-like behavior for csv.reader
+    # Columns are divided by semicolon (';')
+    return _parse_pb_rows(csv.reader(StringIO("\n".join(lines)), delimiter=";"))[:5]
+
+
+def parse_pb_file(f: TextIO) -> Tuple[Dict, Dict, Dict, bool, bool]:
+    """
+    Same as ``parse_pb_lines`` but reads rows straight from an open text file,
+    without materializing its lines first. Open the file with ``newline=""``
+    so quoted multi-line values are preserved.
+    """
+    return _parse_pb_rows(csv.reader(f, delimiter=";"))[:5]
+
+
+def parse_pb_file_meta(f: TextIO) -> Dict[str, str]:
+    """
+    Parse only the META section of an open PB file. Rows are read straight
+    from ``f`` and reading stops at the next section, so PROJECTS and VOTES
+    are never touched.
+    """
+    reader = csv.reader(f, delimiter=";")
+    for row in reader:
+        if row and row[0].strip().lower() == "meta":
+            break
+    else:
+        return {}
+    next(reader, None)  # key;value header
+    meta: Dict[str, str] = {}
+    for row in reader:
+        if not row:
+            continue
+        if row[0].strip().lower() in ("projects", "votes"):
+            break
+        if len(row) >= 2:
+            meta[row[0]] = row[1].strip()
+    return meta
+
+
+def parse_pb_file_preview(f: TextIO, votes_limit: int) -> PBPreview:
+    """
+    Like ``parse_pb_file`` but stops building vote dicts after ``votes_limit``
+    rows; the remaining votes are only counted and their columns noted.
+    """
+    r = _parse_pb_rows(csv.reader(f, delimiter=";"), votes_limit)
+    vote_keys: Set[str] = set(r.skipped_vote_keys)
+    for row in r.votes.values():
+        vote_keys.update(row)
+    return PBPreview(
+        r.meta,
+        r.projects,
+        r.votes,
+        r.votes_in_projects,
+        r.scores_in_projects,
+        len(r.votes) + r.skipped_votes,
+        vote_keys,
+    )
+
+
+def parse_pb_file_summary(f: TextIO) -> PBSummary:
+    """
+    Parse META and PROJECTS fully but only tally VOTES (count and 'vote'
+    lengths) without building a dict per voter.
+    """
+    r = _parse_pb_rows(csv.reader(f, delimiter=";"), votes_limit=0)
+    return PBSummary(
+        r.meta,
+        r.projects,
+        r.votes_in_projects,
+        r.scores_in_projects,
+        r.skipped_votes,
+        r.skipped_vote_length_sum,
+        r.skipped_vote_length_count,
+    )
+
+
+def parse_pb_path_summary(path: Union[str, os.PathLike]) -> PBSummary:
+    """
+    Same result as ``parse_pb_file_summary`` for the file at ``path``.
+
+    The file is memory-mapped: META and PROJECTS go through the csv parser,
+    while VOTES is tallied with bytes ``split``/``find``/``count``, which scan
+    in C rather than building a str row per voter.
+    Anything the byte scan cannot reproduce exactly (quotes, non-ASCII, bare
+    CR, duplicate IDs, ...) falls back to ``parse_pb_file_summary``.
+    """
+    with open(path, "rb") as fb:
+        if os.fstat(fb.fileno()).st_size:
+            with mmap.mmap(fb.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                summary = _summary_from_buffer(mm)
+            if summary is not None:
+                return summary
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return parse_pb_file_summary(f)
+
+
+def _summary_from_buffer(buf: mmap.mmap) -> Optional[PBSummary]:
+    m = _VOTES_MARKER.search(buf)
+    if m is None:
+        return None
+    head_end = buf.find(b"\n", m.start())
+    if head_end < 0:
+        return None
+    tally = _tally_vote_lines(buf[head_end + 1 :])
+    if tally is None:
+        return None
+
+    rows: List[List[str]] = []
+
+    def _rows() -> Iterator[List[str]]:
+        for row in csv.reader(
+            StringIO(buf[: head_end + 1].decode("utf-8"), newline=""), delimiter=";"
+        ):
+            rows.append(row)
+            yield row
+
+    r = _parse_pb_rows(_rows(), votes_limit=0)
+    # The marker must be the last row csv saw; otherwise it sat inside a
+    # quoted value and the byte offsets do not match the real rows
+    if r.skipped_votes or not rows or not rows[-1]:
+        return None
+    if rows[-1][0].strip().lower() != "votes":
+        return None
+    num_votes, length_sum, length_count = tally
+    return PBSummary(
+        r.meta,
+        r.projects,
+        r.votes_in_projects,
+        r.scores_in_projects,
+        num_votes,
+        length_sum,
+        length_count,
+    )
+
+
+def _tally_vote_lines(data: bytes) -> Optional[Tuple[int, int, int]]:
+    """(voters, 'vote' length sum, rows with a 'vote' cell) from the VOTES
+    header and rows, or None when the csv path is needed to match exactly."""
+    if not data.isascii() or any(b in data for b in _SLOW_PATH_BYTES):
+        return None
+    if b"\r" in data:
+        if data.count(b"\r") != data.count(b"\r\n"):
+            return None
+        data = data.replace(b"\r\n", b"\n")
+    # A second section marker ends VOTES; leave that to the csv path
+    if _has_section_row(data.lower(), data.find(b"\n") + 1 or len(data)):
+        return None
+    lines = data.split(b"\n")
+    header = lines[0].decode("ascii").split(";")
+    if header[0].strip().lower() != "voter_id":
+        return None
+    vote_col = 0
+    for i in range(1, len(header)):
+        if header[i].strip() == "vote":
+            vote_col = i
+
+    # Line splitting, ID collection and comma counting all run in C;
+    # only the per-row split is a Python-level step
+    rows = [line.split(b";", vote_col + 1) for line in lines[1:] if line]
+    num_votes = len(rows)
+    if len({row[0] for row in rows}) != num_votes:
+        return None
+    if not vote_col:
+        return num_votes, 0, 0
+    cells = [row[vote_col] for row in rows if len(row) > vote_col]
+    joined = b"\n".join(cells)
+    if (
+        not joined.translate(None, b"0123456789,\n")
+        and joined[:1] not in (b"", b",", b"\n")
+        and joined[-1:] not in (b",", b"\n")
+        and b",," not in joined
+        and b",\n" not in joined
+        and b"\n," not in joined
+        and b"\n\n" not in joined
+    ):
+        # Plain numeric ID lists throughout: one ID per comma, plus one per cell
+        return num_votes, joined.count(b",") + len(cells), len(cells)
+    length_sum = 0
+    for cell in cells:
+        for v in cell.split(b","):
+            if v.strip():
+                length_sum += 1
+    return num_votes, length_sum, len(cells)
+
+
+def _has_section_row(lowered: bytes, start: int) -> bool:
+    # Section names are rare in VOTES, so find them first and only then
+    # check they open a line as the first cell
+    for name in _SECTION_NAMES:
+        i = lowered.find(name, start)
+        while i >= 0:
+            line_start = lowered.rfind(b"\n", 0, i) + 1
+            if line_start >= start and _SECTION_ROW.match(lowered, line_start):
+                return True
+            i = lowered.find(name, i + 1)
+    return False
+
+
+def _parse_pb_rows(
+    reader: Iterator[List[str]], votes_limit: Optional[int] = None
+) -> _ParsedRows:
+    # Values are stripped strings, so callers need no str()/strip() on them
+    meta: Dict[str, str] = {}
     projects: Dict = {}
     votes: Dict = {}
     section = ""
     header: List[str] = []
     votes_in_projects = False
     scores_in_projects = False
-
-    # Use StringIO to simulate file-like behavior for csv.reader
-    # Columns are divided by semicolon (';')
-    reader = csv.reader(StringIO("\n".join(lines)), delimiter=";")
+    skipped_ids: Set[str] = set()
+    skipped_width = 0
+    skipped_vote_keys: Set[str] = set()
+    skipped_vote_length_sum = 0
+    skipped_vote_length_count = 0
+    vote_col: Optional[int] = None
 
     for row in reader:
         if not row:
@@ -41,6 +295,12 @@ def parse_pb_lines(lines: List[str]) -> Tuple[Dict, Dict, Dict, bool, bool]:
                     raise ValueError(
                         f"First value in VOTES section is not 'voter_id': {check_header}"
                     )
+            if section == "votes":
+                # Column stored under the 'vote' key (last one wins, as in the dicts)
+                vote_col = None
+                for i in range(1, len(header)):
+                    if header[i].strip() == "vote":
+                        vote_col = i
             continue
 
         if section == "meta":
@@ -63,13 +323,35 @@ def parse_pb_lines(lines: List[str]) -> Tuple[Dict, Dict, Dict, bool, bool]:
         if section == "votes":
             if not row:
                 continue
+            if votes_limit is not None and len(votes) >= votes_limit:
+                vid = row[0]
+                if vid in votes or vid in skipped_ids:
+                    raise RuntimeError(f"Duplicated Voter ID!! {vid}")
+                skipped_ids.add(vid)
+                if len(row) > skipped_width:
+                    skipped_vote_keys.add("voter_id")
+                    skipped_vote_keys.update(k.strip() for k in header[1 : len(row)])
+                    skipped_width = len(row)
+                if vote_col is not None and vote_col < len(row):
+                    cell = row[vote_col]
+                    # Plain numeric IDs (the usual case) need no splitting
+                    if (
+                        cell.replace(",", "").isdigit()
+                        and ",," not in cell
+                        and cell[0] != ","
+                        and cell[-1] != ","
+                    ):
+                        skipped_vote_length_sum += cell.count(",") + 1
+                    else:
+                        for v in cell.split(","):
+                            if v.strip():
+                                skipped_vote_length_sum += 1
+                    skipped_vote_length_count += 1
+                continue
             vid = row[0]
             if votes.get(vid):
                 raise RuntimeError(f"Duplicated Voter ID!! {vid}")
             votes[vid] = {"voter_id": vid}
-            # Debug: print header and row for inspection
-            # print("VOTES header:", header)
-            # print("VOTES row:", row)
             for it, key in enumerate(header[1:]):
                 if it + 1 < len(row):
                     value = row[it + 1].strip()
@@ -77,6 +359,15 @@ def parse_pb_lines(lines: List[str]) -> Tuple[Dict, Dict, Dict, bool, bool]:
                         votes[vid][key.strip()] = [v.strip() for v in value.split(",") if v.strip()]
                     else:
                         votes[vid][key.strip()] = value
-            # print("Parsed vote:", votes[vid])
 
-    return meta, projects, votes, votes_in_projects, scores_in_projects
+    return _ParsedRows(
+        meta,
+        projects,
+        votes,
+        votes_in_projects,
+        scores_in_projects,
+        len(skipped_ids),
+        skipped_vote_keys,
+        skipped_vote_length_sum,
+        skipped_vote_length_count,
+    )
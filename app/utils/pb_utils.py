@@ -1,12 +1,37 @@
 from __future__ import annotations
 
 import os
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from .load_pb_file import parse_pb_lines
+from .load_pb_file import (
+    PBPreview,
+    PBSummary,
+    parse_pb_file,
+    parse_pb_file_preview,
+    parse_pb_path_summary,
+)
+
+
+# "#<n>:" comment markers; the number is kept as written (leading zeros and all)
+_COMMENT_MARKER = re.compile(r"#([0-9]+):")
+# First four-digit run in META date_begin is taken as the year
+_YEAR_RE = re.compile(r"(\d{4})")
+
+
+def _clean_str(value: Any) -> str:
+    """``str(value).strip()`` without the ``str()`` copy for values already str."""
+    if isinstance(value, str):
+        return value.strip()
+    return str(value).strip()
 
 
 def parse_comments_from_meta(meta: Dict[str, Any]) -> List[str]:
@@ -16,18 +41,22 @@ def parse_comments_from_meta(meta: Dict[str, Any]) -> List[str]:
     sequential markers like "#1:", "#2:", ... on one or multiple lines.
     Returns a list of plain comment texts without trailing punctuation.
     """
-    raw = str(meta.get("comment", "")).strip()
+    raw = _clean_str(meta.get("comment", ""))
     if not raw:
         return []
     # Normalize to single line to simplify marker search
     s = raw.replace("\n", " ")
+    # One scan collects every marker's offsets, so each "#n:" lookup below
+    # is a dict hit instead of another find() over the whole string
+    offsets: Dict[str, List[int]] = {}
+    for m in _COMMENT_MARKER.finditer(s):
+        offsets.setdefault(m.group(1), []).append(m.start())
     parts: List[str] = []
     expecting = 1
     while True:
         marker = f"#{expecting}:"
-        next_marker = f"#{expecting + 1}:"
-        start = s.find(marker)
-        if start == -1:
+        starts = offsets.get(str(expecting))
+        if not starts:
             # No marker found. If it's the first expected marker, treat whole
             # string as a single comment.
             if expecting == 1 and s:
@@ -35,8 +64,11 @@ def parse_comments_from_meta(meta: Dict[str, Any]) -> List[str]:
                 if txt:
                     parts.append(txt)
             break
-        start_text = start + len(marker)
-        end = s.find(next_marker, start_text)
+        start_text = starts[0] + len(marker)
+        # Text runs to the first "#<n+1>:" after it, as sequential markers go
+        following = offsets.get(str(expecting + 1), [])
+        i = bisect_left(following, start_text)
+        end = following[i] if i < len(following) else -1
         chunk = s[start_text:] if end == -1 else s[start_text:end]
         txt = chunk.strip().rstrip(";")
         if txt:
@@ -47,13 +79,16 @@ def parse_comments_from_meta(meta: Dict[str, Any]) -> List[str]:
     return parts
 
 
+@lru_cache(maxsize=1)
 def workspace_root() -> Path:
+    # resolve() costs realpath syscalls and __file__ never changes
     return Path(__file__).resolve().parents[2]
 
 
 def pb_folder() -> Path:
     # Allow overriding the PB files directory via env var.
     # If PB_FILES_DIR is relative, resolve it against the workspace root.
+    # Left uncached so PB_FILES_DIR is honoured; only the root lookup is memoized.
     env_val = os.environ.get("PB_FILES_DIR")
     if env_val:
         p = Path(env_val).expanduser()
@@ -77,21 +112,141 @@ def pb_depreciated_folder() -> Path:
     return workspace_root() / "pb_files_depreciated"
 
 
-def read_file_lines(path: Path) -> List[str]:
+# Recently parsed PB files keyed by path and validated against (mtime_ns, size),
+# as (sig, value, weight). Kept small: a parsed VOTES section takes several
+# times its file size in memory, so full parses are also bounded by the total
+# size of their source files, and big files are not kept at all.
+_PARSED_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Any, int]]" = OrderedDict()
+_PARSED_CACHE_MAX = 8
+_PARSED_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_PARSED_CACHE_FILE_MAX_BYTES = 4 * 1024 * 1024
+_PARSED_CACHE_LOCK = threading.Lock()
+# Derived tile dicts are small, so many more of them are kept (same keying)
+_TILE_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Any, int]]" = OrderedDict()
+_TILE_CACHE_MAX = 1024
+
+
+def _parsed_cache_get(
+    key: str, sig: Tuple[int, int], cache: "OrderedDict" = _PARSED_CACHE
+) -> Any:
+    with _PARSED_CACHE_LOCK:
+        hit = cache.get(key)
+        if hit is not None and hit[0] == sig:
+            cache.move_to_end(key)
+            return hit[1]
+    return None
+
+
+def _parsed_cache_put(
+    key: str,
+    sig: Tuple[int, int],
+    value: Any,
+    cache: "OrderedDict" = _PARSED_CACHE,
+    max_size: int = _PARSED_CACHE_MAX,
+    weight: int = 0,
+    max_weight: Optional[int] = None,
+) -> None:
+    with _PARSED_CACHE_LOCK:
+        cache[key] = (sig, value, weight)
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+        if max_weight is not None:
+            total = sum(entry[2] for entry in cache.values())
+            while total > max_weight and len(cache) > 1:
+                total -= cache.popitem(last=False)[1][2]
+
+
+def parse_pb_file_cached(path: Path) -> Tuple[Dict, Dict, Dict, bool, bool]:
+    """Return ``parse_pb_file`` output for ``path``, reusing it while unchanged.
+
+    Results are shared between callers and must be treated as read-only.
+    """
+    st = path.stat()
+    key = str(path)
+    sig = (st.st_mtime_ns, st.st_size)
+    parsed = _parsed_cache_get(key, sig)
+    if parsed is not None:
+        return parsed
+    with path.open("r", encoding="utf-8", newline="") as f:
+        parsed = parse_pb_file(f)
+    if st.st_size <= _PARSED_CACHE_FILE_MAX_BYTES:
+        _parsed_cache_put(
+            key,
+            sig,
+            parsed,
+            weight=st.st_size,
+            max_weight=_PARSED_CACHE_MAX_BYTES,
+        )
+    return parsed
+
+
+def parse_pb_preview_cached(path: Path, votes_limit: int) -> PBPreview:
+    """Return ``parse_pb_file_preview`` output for ``path``, reusing it while unchanged.
+
+    A cached full parse of the same file is sliced instead of re-reading it.
+    Results are shared between callers and must be treated as read-only.
+    """
+    st = path.stat()
+    sig = (st.st_mtime_ns, st.st_size)
+    full = _parsed_cache_get(str(path), sig)
+    if full is not None:
+        meta, projects, votes, vip, sip = full
+        vote_keys: set = set()
+        for row in votes.values():
+            vote_keys.update(row)
+        head = dict(islice(votes.items(), votes_limit))
+        return PBPreview(meta, projects, head, vip, sip, len(votes), vote_keys)
+    key = f"{path}\0preview{votes_limit}"
+    preview = _parsed_cache_get(key, sig)
+    if preview is not None:
+        return preview
     with path.open("r", encoding="utf-8", newline="") as f:
-        return [line.rstrip("\n") for line in f]
+        preview = parse_pb_file_preview(f, votes_limit)
+    _parsed_cache_put(key, sig, preview)
+    return preview
 
 
-def compute_webpage_name(meta: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
-    country = str(meta.get("country", "")).strip()
-    unit = str(meta.get("unit", meta.get("city", meta.get("district", "")))).strip()
-    instance = str(meta.get("instance", meta.get("year", ""))).strip()
-    subunit = str(meta.get("subunit", "")).strip()
+def compute_webpage_name(meta: Dict[str, str]) -> Tuple[str, str, str, str, str]:
+    # META values come from the parser already stripped
+    country = meta.get("country", "")
+    unit = meta.get("unit", meta.get("city", meta.get("district", "")))
+    instance = meta.get("instance", meta.get("year", ""))
+    subunit = meta.get("subunit", "")
     webpage_parts = [p for p in [country, unit, instance, subunit] if p]
     webpage_name = "_".join(webpage_parts)
     return webpage_name, country, unit, instance, subunit
 
 
+def _project_cost(c: Any) -> int:
+    """Project cost as an int, or 0 when missing or not parsable.
+
+    Robust cost parsing: accept ints, floats, and numeric strings like
+    '40000' or '40000.0' (decimal comma allowed).
+    """
+    try:
+        if isinstance(c, str):
+            try:
+                return int(c)
+            except ValueError:
+                # Normalize decimal comma and whitespace
+                return int(float(c.strip().replace(",", ".")))
+        if isinstance(c, (int, float)):
+            return int(float(c))
+    except Exception:
+        # Ignore non-parsable costs for the fully_funded heuristic
+        pass
+    return 0
+
+
+def _meta_int(meta: Dict[str, str], key: str) -> Optional[int]:
+    """Whole-number META constraint (e.g. ``max_length``), or None if absent."""
+    value = meta.get(key, "")
+    if value.replace(".", "", 1).isdigit():
+        return int(float(value))
+    return None
+
+
 def build_group_key(country: str, unit: str, instance: str, subunit: str) -> str:
     parts = [country or "", unit or "", instance or "", subunit or ""]
     key = "|".join(p.strip().lower() for p in parts)
@@ -110,9 +265,14 @@ def build_group_key(country: str, unit: str, instance: str, subunit: str) -> str
         return key[:MAXLEN]
 
 
-def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
-    lines = read_file_lines(pb_path)
-    meta, projects, votes, votes_in_projects, scores_in_projects = parse_pb_lines(lines)
+def parse_pb_to_tile(
+    pb_path: Path, summary: Optional[PBSummary] = None
+) -> Dict[str, Any]:
+    # Tiles only need vote totals, so VOTES is tallied rather than materialized.
+    # Callers that already hold the summary pass it to skip re-reading the file.
+    if summary is None:
+        summary = parse_pb_path_summary(pb_path)
+    meta, projects = summary.meta, summary.projects
 
     webpage_name, country, unit, instance, subunit = compute_webpage_name(meta)
     title = (
@@ -125,40 +285,32 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
     comments = parse_comments_from_meta(meta)
     currency = meta.get("currency", "")
     try:
-        num_votes = int(meta.get("num_votes", len(votes)))
+        num_votes = int(meta.get("num_votes", summary.num_votes))
     except Exception:
-        num_votes = len(votes)
+        num_votes = summary.num_votes
     try:
         num_projects = int(meta.get("num_projects", len(projects)))
     except Exception:
         num_projects = len(projects)
     budget_raw = meta.get("budget")
-    try:
-        # Convert to float first, then to int to truncate decimal part
-        budget = int(float(budget_raw)) if budget_raw is not None else None
-    except (ValueError, TypeError):
-        budget = None
-    vote_type = str(meta.get("vote_type", meta.get("rule", ""))).lower()
+    budget: Optional[int] = None
+    if budget_raw is not None:
+        try:
+            budget = int(budget_raw)
+        except (ValueError, TypeError):
+            try:
+                # Decimal budgets: convert to float first, then truncate
+                budget = int(float(budget_raw))
+            except (ValueError, TypeError):
+                budget = None
+    vote_type = meta.get("vote_type", meta.get("rule", "")).lower()
 
     # vote length
+    # Only the 'vote' field is used for vote length calculation.
+    # Other columns (e.g., 'age', 'sex', etc.) do not affect this value.
     vote_length_float: Optional[float] = None
-    try:
-        lengths: List[int] = []
-        for v in votes.values():
-            # Only the 'vote' field is used for vote length calculation.
-            # Other columns (e.g., 'age', 'sex', etc.) do not affect this value.
-            sel = v.get("vote", "")
-            if isinstance(sel, list):
-                lengths.append(len([s for s in sel if s]))
-            elif isinstance(sel, str):
-                sel = sel.strip()
-                if not sel:
-                    continue
-                lengths.append(len([s for s in sel.split(",") if s]))
-        if lengths:
-            vote_length_float = sum(lengths) / len(lengths)
-    except Exception:
-        vote_length_float = None
+    if summary.vote_length_count:
+        vote_length_float = summary.vote_length_sum / summary.vote_length_count
 
     # fully funded heuristic
     # According to the pabulib format, fully_funded means the budget was greater than
@@ -169,7 +321,7 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
     has_selected_col = False
     
     # First check if there's an explicit fully_funded flag in metadata
-    fully_funded_meta = str(meta.get("fully_funded", "")).strip().lower() in {
+    fully_funded_meta = meta.get("fully_funded", "").lower() in {
         "1",
         "true",
         "yes",
@@ -177,34 +329,19 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
     }
     
     try:
-        selected_flags = []
-        for p in projects.values():
-            if "selected" in p:
-                has_selected_col = True
-            selected_flags.append(str(p.get("selected", "0")).strip())
-        all_selected = len(selected_flags) > 0 and all(v == "1" for v in selected_flags)
-        
-        # Count selected projects
-        for p in projects.values():
-            if str(p.get("selected", "0")).strip() == "1":
-                selected_count += 1
-        
-        # Calculate total cost of ALL projects (not just selected) for fully_funded check
-        total_all_projects_cost = 0
-        for p in projects.values():
-            c = p.get("cost")
-            # Robust cost parsing: accept ints, floats, and numeric strings like '40000' or '40000.0'
-            try:
-                if isinstance(c, (int, float)):
-                    total_all_projects_cost += int(float(c))
-                elif isinstance(c, str):
-                    # Normalize decimal comma and whitespace
-                    cs = c.strip().replace(",", ".")
-                    total_all_projects_cost += int(float(cs))
-            except Exception:
-                # Ignore non-parsable costs for the fully_funded heuristic
-                pass
-        
+        # Selected count/flags and total cost of ALL projects (not just
+        # selected) for the fully_funded check, one column at a time
+        rows = projects.values()
+        has_selected_col = any("selected" in p for p in rows)
+        selected_count = [_clean_str(p.get("selected", "0")) for p in rows].count("1")
+        all_selected = len(rows) > 0 and selected_count == len(rows)
+        costs = [p.get("cost") for p in rows]
+        try:
+            # Plain integer strings, the usual PB form, sum in a single C-level pass
+            total_all_projects_cost = sum(map(int, costs))
+        except (TypeError, ValueError):
+            total_all_projects_cost = sum(map(_project_cost, costs))
+
         # Fully funded if: explicit meta flag, OR all projects selected, OR budget >= total cost of all projects
         fully_funded = fully_funded_meta or all_selected or (
             budget is not None and total_all_projects_cost > 0 and budget >= total_all_projects_cost
@@ -220,11 +357,9 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
     # Detect year
     year_int: Optional[int] = None
     try:
-        import re
-
-        date_begin = str(meta.get("date_begin", "")).strip()
+        date_begin = meta.get("date_begin", "")
         if date_begin:
-            m = re.search(r"(\d{4})", date_begin)
+            m = _YEAR_RE.search(date_begin)
             if m:
                 y = int(m.group(1))
                 if 1900 <= y <= 2100:
@@ -233,7 +368,7 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
             for cand in [meta.get("year"), instance]:
                 if cand is None:
                     continue
-                s = str(cand).strip()
+                s = _clean_str(cand)
                 if s.isdigit():
                     y = int(s)
                     if 1900 <= y <= 2100:
@@ -246,11 +381,11 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
     vlen = vote_length_float or 0.0
     quality = (vlen**2) * (float(num_projects) ** 1) * (float(num_votes) ** 0.5)
 
-    rule_raw = str(meta.get("rule", "")).strip()
-    edition = str(meta.get("edition", "")).strip()
-    language = str(meta.get("language", "")).strip()
+    rule_raw = meta.get("rule", "")
+    edition = meta.get("edition", "")
+    language = meta.get("language", "")
 
-    experimental = str(meta.get("experimental", "")).strip().lower() in {
+    experimental = meta.get("experimental", "").lower() in {
         "1",
         "true",
         "yes",
@@ -265,9 +400,9 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
     # Collect unique category/beneficiaries tokens and their counts per file
     # Use normalized keys (lowercased, trimmed) for uniqueness per file to avoid duplicates like
     # "Groen en Duurzaamheid" vs "groen en duurzaamheid".
-    category_counts: dict[str, int] = {}
+    category_counts: dict[str, int] = Counter()
     category_display: dict[str, str] = {}
-    beneficiaries_counts: dict[str, int] = {}
+    beneficiaries_counts: dict[str, int] = Counter()
     beneficiaries_display: dict[str, str] = {}
     try:
         if projects:
@@ -276,7 +411,7 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
                 try:
                     if val is None:
                         return None
-                    s = str(val).strip()
+                    s = _clean_str(val)
                     if not s:
                         return None
                     # Normalize decimal comma
@@ -289,7 +424,7 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
             for p in projects.values():
                 if not isinstance(p, dict):
                     continue
-                lower_map = {str(k).strip().lower(): v for k, v in p.items()}
+                lower_map = {_clean_str(k).lower(): v for k, v in p.items()}
                 # Common variants
                 cand_lat_keys = ("latitude", "lat")
                 cand_lon_keys = ("longitude", "lon", "long")
@@ -317,7 +452,7 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
                         if isinstance(val, list):
                             tokens = [str(x).strip() for x in val if str(x).strip()]
                         else:
-                            s = str(val).strip()
+                            s = _clean_str(val)
                             if s:
                                 tokens = [t.strip() for t in s.split(",") if t.strip()]
                         for t in tokens:
@@ -325,7 +460,7 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
                             norm = t.lower()
                             if norm not in category_display:
                                 category_display[norm] = t
-                            category_counts[norm] = category_counts.get(norm, 0) + 1
+                            category_counts[norm] += 1
                 for tk in ("beneficiaries",):
                     if tk in lower_map:
                         val = lower_map[tk]
@@ -333,7 +468,7 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
                         if isinstance(val, list):
                             tokens = [str(x).strip() for x in val if str(x).strip()]
                         else:
-                            s = str(val).strip()
+                            s = _clean_str(val)
                             if s:
                                 tokens = [t.strip() for t in s.split(",") if t.strip()]
                         for t in tokens:
@@ -341,9 +476,7 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
                             norm = t.lower()
                             if norm not in beneficiaries_display:
                                 beneficiaries_display[norm] = t
-                            beneficiaries_counts[norm] = (
-                                beneficiaries_counts.get(norm, 0) + 1
-                            )
+                            beneficiaries_counts[norm] += 1
                 # If all flags are detected we can stop scanning further projects
                 if has_geo and has_category and has_beneficiaries:
                     # don't break early anymore; we want full token sets across projects
@@ -393,11 +526,29 @@ def parse_pb_to_tile(pb_path: Path) -> Dict[str, Any]:
         "categories_display": category_display,
         "beneficiaries_display": beneficiaries_display,
         # Meta constraints
-        "min_length": int(float(str(meta.get("min_length", "")).strip())) if str(meta.get("min_length", "")).strip().replace(".", "", 1).isdigit() else None,
-        "max_length": int(float(str(meta.get("max_length", "")).strip())) if str(meta.get("max_length", "")).strip().replace(".", "", 1).isdigit() else None,
-        "min_sum_points": int(float(str(meta.get("min_sum_points", "")).strip())) if str(meta.get("min_sum_points", "")).strip().replace(".", "", 1).isdigit() else None,
-        "max_sum_points": int(float(str(meta.get("max_sum_points", "")).strip())) if str(meta.get("max_sum_points", "")).strip().replace(".", "", 1).isdigit() else None,
-        "max_sum_cost": int(float(str(meta.get("max_sum_cost", "")).strip())) if str(meta.get("max_sum_cost", "")).strip().replace(".", "", 1).isdigit() else None,
-        "max_sum_cost_per_category": int(float(str(meta.get("max_sum_cost_per_category", "")).strip())) if str(meta.get("max_sum_cost_per_category", "")).strip().replace(".", "", 1).isdigit() else None,
-        "max_total_cost": int(float(str(meta.get("max_total_cost", "")).strip())) if str(meta.get("max_total_cost", "")).strip().replace(".", "", 1).isdigit() else None,
+        "min_length": _meta_int(meta, "min_length"),
+        "max_length": _meta_int(meta, "max_length"),
+        "min_sum_points": _meta_int(meta, "min_sum_points"),
+        "max_sum_points": _meta_int(meta, "max_sum_points"),
+        "max_sum_cost": _meta_int(meta, "max_sum_cost"),
+        "max_sum_cost_per_category": _meta_int(meta, "max_sum_cost_per_category"),
+        "max_total_cost": _meta_int(meta, "max_total_cost"),
     }
+
+
+def parse_pb_to_tile_cached(pb_path: Path) -> Dict[str, Any]:
+    """Return ``parse_pb_to_tile`` output for ``pb_path``, reusing it while unchanged.
+
+    For listings that rebuild tiles for the same files on every view (e.g.
+    staged uploads). Results are shared between callers and must be treated
+    as read-only.
+    """
+    st = pb_path.stat()
+    key = str(pb_path)
+    sig = (st.st_mtime_ns, st.st_size)
+    tile = _parsed_cache_get(key, sig, _TILE_CACHE)
+    if tile is not None:
+        return tile
+    tile = parse_pb_to_tile(pb_path)
+    _parsed_cache_put(key, sig, tile, _TILE_CACHE, _TILE_CACHE_MAX)
+    return tile
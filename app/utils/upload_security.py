@@ -4,11 +4,20 @@ import re
 import shutil
 import time
 import uuid
+from functools import lru_cache
 from pathlib import Path
 
+from werkzeug.utils import secure_filename
+
 from .pb_utils import workspace_root
 
 ALLOWED_EXTENSIONS = {".pb"}
+_ALLOWED_SUFFIXES = tuple(ALLOWED_EXTENSIONS)
+# Bytes considered "text": common control chars, printable ASCII and UTF-8
+# continuation bytes. Built once and used with bytes.translate() to strip them.
+_TEXT_BYTES = bytes(
+    [7, 8, 9, 10, 12, 13, 27, *range(32, 127), *range(0x80, 0xBF + 1)]
+)
 _ARCHIVE_SIGNATURES = (
     (b"PK\x03\x04", "zip archive"),
     (b"PK\x05\x06", "zip archive"),
@@ -27,19 +36,20 @@ _EMAIL_RE = re.compile(
 
 
 def is_allowed_extension(filename: str) -> bool:
-    name = (filename or "").lower().strip()
-    return any(name.endswith(ext) for ext in ALLOWED_EXTENSIONS)
+    return (filename or "").lower().strip().endswith(_ALLOWED_SUFFIXES)
+
+
+@lru_cache(maxsize=1024)
+def secure_upload_name(name: str) -> str:
+    """Memoized ``werkzeug.utils.secure_filename`` for per-file upload loops."""
+    return secure_filename(name)
 
 
 def is_probably_text_bytes(b: bytes, max_nontext_ratio: float = 0.20) -> bool:
     if not b:
         return True
-    # Consider a set of common printable bytes (ASCII + common utf-8 parts)
-    text_chars = bytearray({7, 8, 9, 10, 12, 13, 27})
-    text_chars.extend(range(32, 127))
-    # UTF-8 continuation bytes are 0x80-0xBF; they can appear in text
-    text_chars.extend(range(0x80, 0xBF + 1))
-    nontext = sum(1 for ch in b if ch not in text_chars)
+    # Whatever survives deleting the known text bytes is non-text
+    nontext = len(b.translate(None, _TEXT_BYTES))
     return nontext / max(1, len(b)) <= max_nontext_ratio
 
 
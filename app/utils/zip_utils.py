@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .file_helpers import workspace_root
+
+# Members up to this size are read whole and compressed from one buffer;
+# larger ones are streamed through ZipFile.write on the writer thread.
+INLINE_MAX_BYTES = 8 * 1024 * 1024
+
+# Large members are copied in pieces of this size; a streamed archive hands
+# each piece to the client rather than holding the whole member in memory.
+STREAM_CHUNK_BYTES = 1 << 20
+
+# Buffer size for on-disk archives, so headers, payloads and the central
+# directory reach the OS in large writes rather than one call per record.
+WRITE_BUFFER_BYTES = 1 << 20
+
+# Compressed members are kept here, one blob per source path, so unchanged
+# PB files are not deflated again on the next archive build.
+DEFLATE_CACHE_DIR = workspace_root() / "cache" / "deflate"
+# Blob header: source mtime_ns, source size, CRC-32, source path length; the
+# source path (so stale blobs can be pruned) and the raw DEFLATE data follow
+_BLOB_HEADER = struct.Struct("<qQIH")
+# Leftover temp files from an interrupted write are removed after this long
+_BLOB_TMP_MAX_AGE = 60 * 60
+
+# ZipFile internals _write_deflated relies on to append pre-compressed
+# members. If a Python release drops any of them, every member goes through
+# the public zf.open(zinfo, "w") path instead (no parallel deflate).
+_ZIPFILE_INTERNALS = (
+    "_lock",
+    "_writing",
+    "_seekable",
+    "_writecheck",
+    "_didModify",
+    "start_dir",
+)
+
+
+def _has_zipfile_internals() -> bool:
+    try:
+        with zipfile.ZipFile(io.BytesIO(), mode="w") as zf:
+            return all(hasattr(zf, name) for name in _ZIPFILE_INTERNALS)
+    except Exception:
+        return False
+
+
+_DIRECT_APPEND = _has_zipfile_internals()
+
+
+def _source_key(path: Path) -> bytes:
+    return os.fsencode(os.path.abspath(path))
+
+
+def _blob_path(path: Path) -> Path:
+    key = hashlib.sha1(_source_key(path)).hexdigest()
+    return DEFLATE_CACHE_DIR / f"{key}.bin"
+
+
+def _read_blob_header(f) -> Tuple[int, int, int, bytes]:
+    mtime_ns, size, crc, name_len = _BLOB_HEADER.unpack(f.read(_BLOB_HEADER.size))
+    source = f.read(name_len)
+    if len(source) != name_len:
+        raise struct.error("truncated blob header")
+    return mtime_ns, size, crc, source
+
+
+def _load_blob(
+    blob: Path, path: Path, st: os.stat_result
+) -> Optional[Tuple[int, bytes]]:
+    try:
+        with open(blob, "rb") as f:
+            mtime_ns, size, crc, source = _read_blob_header(f)
+            if mtime_ns != st.st_mtime_ns or size != st.st_size:
+                return None
+            if source != _source_key(path):
+                return None
+            return crc, f.read()
+    except (OSError, struct.error):
+        return None
+
+
+def _store_blob(
+    blob: Path, path: Path, st: os.stat_result, crc: int, data: bytes
+) -> None:
+    # Write-then-rename; concurrent builders may race on the same blob
+    tmp = blob.with_name(f"{blob.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    source = _source_key(path)
+    try:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(
+                _BLOB_HEADER.pack(st.st_mtime_ns, st.st_size, crc, len(source))
+            )
+            f.write(source)
+            f.write(data)
+        os.replace(tmp, blob)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _deflate_member(
+    path: Path, arcname: str, compress_type: int = zipfile.ZIP_DEFLATED
+) -> Tuple[zipfile.ZipInfo, Optional[bytes]]:
+    st = os.stat(path)
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = compress_type
+    if st.st_size > INLINE_MAX_BYTES or not _DIRECT_APPEND:
+        return zinfo, None
+    if compress_type == zipfile.ZIP_STORED:
+        with open(path, "rb") as src:
+            raw = src.read()
+        zinfo.file_size = zinfo.compress_size = len(raw)
+        zinfo.CRC = zlib.crc32(raw)
+        return zinfo, raw
+    blob = _blob_path(path)
+    cached = _load_blob(blob, path, st)
+    if cached is not None:
+        crc, data = cached
+        file_size = st.st_size
+    else:
+        with open(path, "rb") as src:
+            raw = src.read()
+        # Raw DEFLATE stream at zipfile's default level; zlib drops the GIL here
+        co = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        data = co.compress(raw) + co.flush()
+        crc = zlib.crc32(raw)
+        file_size = len(raw)
+        if file_size == st.st_size:
+            _store_blob(blob, path, st, crc, data)
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(data)
+    zinfo.CRC = crc
+    return zinfo, data
+
+
+def prune_deflate_cache() -> int:
+    """Delete cached blobs whose source is gone or has changed since.
+
+    Blobs are only overwritten when the same path is compressed again, so
+    deleted, archived or replaced PB files would otherwise leave theirs behind.
+    Unreadable blobs (including the older header format) go too. Returns the
+    number of files removed.
+    """
+    removed = 0
+    now = time.time()
+    try:
+        entries = list(os.scandir(DEFLATE_CACHE_DIR))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.name.endswith(".tmp"):
+                stale = now - entry.stat().st_mtime > _BLOB_TMP_MAX_AGE
+            elif entry.name.endswith(".bin"):
+                try:
+                    with open(entry.path, "rb") as f:
+                        mtime_ns, size, _crc, source = _read_blob_header(f)
+                    st = os.stat(source)
+                    stale = st.st_mtime_ns != mtime_ns or st.st_size != size
+                except (OSError, struct.error):
+                    stale = True
+            else:
+                continue
+            if stale:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def _write_deflated(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: bytes) -> None:
+    """Append an already-compressed (or stored) member to ``zf``.
+
+    Mirrors ``ZipFile._open_to_write`` but, since CRC and sizes are known up
+    front, writes the final local header once with no seek-back. Only used
+    when ``_DIRECT_APPEND`` found the internals it touches.
+    """
+    with zf._lock:
+        if zf._writing:
+            raise ValueError("ZIP file has another write handle open")
+        zinfo.flag_bits = 0x00
+        if not zinfo.external_attr:
+            zinfo.external_attr = 0o600 << 16
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.write(zinfo.FileHeader(False))
+        zf.fp.write(data)
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def _copy_member(
+    zf: zipfile.ZipFile, path: Path, zinfo: zipfile.ZipInfo
+) -> Iterator[None]:
+    # Same as ZipFile.write for a regular file, pausing after every chunk
+    with open(path, "rb") as src, zf.open(zinfo, "w") as dst:
+        while True:
+            buf = src.read(STREAM_CHUNK_BYTES)
+            if not buf:
+                break
+            dst.write(buf)
+            yield
+
+
+def _iter_written(
+    zf: zipfile.ZipFile,
+    pairs: List[Tuple[str, Path]],
+    on_error: Optional[Callable[[str, Exception], None]],
+    max_workers: Optional[int],
+    compress_type: int = zipfile.ZIP_DEFLATED,
+    chunked: bool = False,
+) -> Iterator[Optional[Tuple[int, str]]]:
+    # Deflate on a pool with bounded look-ahead; append in order on this thread.
+    # With chunked=True, large members also yield None after each piece.
+    workers = max_workers or min(8, os.cpu_count() or 1, len(pairs))
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending: deque = deque()
+        next_idx = 0
+        for idx in range(1, len(pairs) + 1):
+            while next_idx < len(pairs) and len(pending) < window:
+                arcname, path = pairs[next_idx]
+                pending.append(
+                    ex.submit(_deflate_member, path, arcname, compress_type)
+                )
+                next_idx += 1
+            arcname, path = pairs[idx - 1]
+            fut = pending.popleft()
+            try:
+                zinfo, data = fut.result()
+                if data is None:
+                    for _ in _copy_member(zf, path, zinfo):
+                        if chunked:
+                            yield None
+                else:
+                    _write_deflated(zf, zinfo, data)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(arcname, e)
+                continue
+            yield idx, arcname
+
+
+def write_files(
+    zf: zipfile.ZipFile,
+    file_pairs: Iterable[Tuple[str, Path]],
+    on_added: Optional[Callable[[int, str], None]] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    max_workers: Optional[int] = None,
+    compress_type: int = zipfile.ZIP_DEFLATED,
+) -> None:
+    """Add ``(arcname, path)`` pairs to ``zf`` in order, compressing in parallel.
+
+    Members are deflated on a thread pool (bounded look-ahead, so memory stays
+    proportional to the worker count) and appended by the calling thread.
+    ``on_added(index, arcname)`` fires after each member is written. Failures
+    are passed to ``on_error`` when given, otherwise raised.
+    ``compress_type=ZIP_STORED`` skips compression.
+    """
+    pairs = list(file_pairs)
+    if not pairs:
+        return
+    for idx, arcname in _iter_written(
+        zf, pairs, on_error, max_workers, compress_type
+    ):
+        if on_added is not None:
+            on_added(idx, arcname)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable target that hands back what was written."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(
+    file_pairs: Iterable[Tuple[str, Path]],
+    max_workers: Optional[int] = None,
+    extra_members: Iterable[Tuple[str, bytes]] = (),
+    compress_type: int = zipfile.ZIP_DEFLATED,
+) -> Iterator[bytes]:
+    """Yield a ZIP of ``(arcname, path)`` pairs chunk by chunk, one per member.
+
+    Suitable as a streaming response body: nothing beyond the in-flight
+    members is held in memory and the first bytes go out after one file.
+    Members over ``INLINE_MAX_BYTES`` go out in ``STREAM_CHUNK_BYTES`` pieces.
+    ``extra_members`` are small ``(arcname, data)`` entries appended last.
+    ``compress_type=ZIP_STORED`` skips compression for the file members.
+    """
+    pairs = list(file_pairs)
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        if pairs:
+            for _ in _iter_written(
+                zf, pairs, None, max_workers, compress_type, chunked=True
+            ):
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        for arcname, data in extra_members:
+            zf.writestr(arcname, data)
+    # Central directory is written on close
+    tail = sink.drain()
+    if tail:
+        yield tail
@@ -9,7 +9,7 @@ Behavior:
 - Skips files whose mtime is <= last refresh unless --full is provided
 
 Usage:
-  python -m scripts.db_refresh [--full]
+  python -m scripts.db_refresh [--full] [--no-parse-cache]
 Env:
   MYSQL_* or DATABASE_URL must be configured (docker-compose provides these)
 """
@@ -17,12 +17,14 @@ Env:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.exc import OperationalError
 
@@ -35,14 +37,15 @@ from app.services.pb_service import (
     compute_is_first_addition,
     invalidate_caches as _invalidate_pb_caches,
 )
-from app.utils.load_pb_file import parse_pb_lines
+from app.utils.file_helpers import workspace_root
+from app.utils.load_pb_file import parse_pb_path_summary
 from app.utils.filename_normalization import normalize_storage_filename
 from app.utils.pb_utils import (
     build_group_key,
     compute_webpage_name,
+    parse_comments_from_meta,
     parse_pb_to_tile,
     pb_folder,
-    read_file_lines,
 )
 
 
@@ -78,40 +81,38 @@ def ensure_db(max_tries: int = 30, sleep_secs: float = 2.0) -> None:
         raise last_err
 
 
-def _parse_comments_from_meta(meta: Dict[str, Any]) -> list[str]:
-    raw = str(meta.get("comment", "")).strip()
-    if not raw:
-        return []
-    s = raw.replace("\n", " ")
-    parts: list[str] = []
-    expecting = 1
-    while True:
-        marker = f"#{expecting}:"
-        next_marker = f"#{expecting + 1}:"
-        start = s.find(marker)
-        if start == -1:
-            if expecting == 1 and s:
-                txt = s.strip().rstrip(";")
-                if txt:
-                    parts.append(txt)
-            break
-        start_text = start + len(marker)
-        end = s.find(next_marker, start_text)
-        chunk = s[start_text:] if end == -1 else s[start_text:end]
-        txt = chunk.strip().rstrip(";")
-        if txt:
-            parts.append(txt)
-        expecting += 1
-        if end == -1:
-            break
-    return parts
+# From this many files on, stat() calls are spread over threads (os.stat
+# releases the GIL, which pays off on cold caches and network filesystems)
+STAT_PARALLEL_MIN_FILES = 256
+STAT_WORKERS = 16
 
 
-def collect_files() -> List[Path]:
+def _stat_entry(e: os.DirEntry) -> Tuple[Path, os.stat_result]:
+    return Path(e.path), e.stat()
+
+
+def scan_files() -> List[Tuple[Path, os.stat_result]]:
+    """List pb_files/*.pb with their stat results in one directory pass."""
     folder = pb_folder()
     folder.mkdir(parents=True, exist_ok=True)
-    files = sorted(folder.glob("*.pb"))
-    return files
+    with os.scandir(folder) as it:
+        # Hidden files are skipped, as glob("*.pb") would
+        found = [
+            e
+            for e in it
+            if e.name.endswith(".pb") and not e.name.startswith(".") and e.is_file()
+        ]
+    if len(found) >= STAT_PARALLEL_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=STAT_WORKERS) as ex:
+            entries = list(ex.map(_stat_entry, found))
+    else:
+        entries = [_stat_entry(e) for e in found]
+    entries.sort(key=lambda item: item[0])
+    return entries
+
+
+def collect_files() -> List[Path]:
+    return [p for p, _st in scan_files()]
 
 
 def load_last_refresh() -> datetime | None:
@@ -130,14 +131,116 @@ def save_refresh_timestamp(kind: str, when: datetime) -> None:
         rs.last_completed_at = when
 
 
+# Below this many files to load, parsing stays in-process (pool start-up
+# would cost more than it saves)
+PARALLEL_MIN_FILES = 32
+
+# (META dict, tile data) for one file
+ParsedFile = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+def parse_file(p: Path) -> ParsedFile:
+    """Parse one PB file into its META dict and tile data (no DB access)."""
+    # One pass serves both META and the tile fields
+    summary = parse_pb_path_summary(p)
+    return summary.meta, parse_pb_to_tile(p, summary)
+
+
+# Parsed META/tile per source path, reused across runs while the file's
+# mtime and size are unchanged (so a --full refresh after a restart only
+# re-parses files that actually changed). A content SHA-1 is kept too, so
+# files whose mtime moved without an edit (fresh clone, restored backup)
+# are recognised without parsing them again.
+PARSE_CACHE_FILE = workspace_root() / "cache" / ".db_refresh_parse_cache.json"
+# Bump when the cached meta/tile layout changes. Edits to the parser modules
+# are picked up without a bump: their contents are hashed into the version.
+PARSE_CACHE_SCHEMA = 1
+_PARSER_SOURCES = (
+    workspace_root() / "app" / "utils" / "load_pb_file.py",
+    workspace_root() / "app" / "utils" / "pb_utils.py",
+)
+
+
+def parse_cache_version() -> str:
+    """Version stamp for cached parses: schema number plus parser source hash."""
+    h = hashlib.sha1(str(PARSE_CACHE_SCHEMA).encode("ascii"))
+    for src in _PARSER_SOURCES:
+        try:
+            h.update(src.read_bytes())
+        except OSError:
+            h.update(b"-")
+    return h.hexdigest()
+
+
+def _file_sig(st: os.stat_result) -> List[int]:
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _file_sha1(p: Path) -> str:
+    with p.open("rb") as f:
+        return hashlib.file_digest(f, "sha1").hexdigest()
+
+
+def load_parse_cache(version: str) -> Dict[str, Any]:
+    """Cached entries by path; empty when written by a different parser version."""
+    try:
+        data = json.loads(PARSE_CACHE_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != version:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_parse_cache(entries: Dict[str, Any], version: str) -> None:
+    tmp = PARSE_CACHE_FILE.with_name(f"{PARSE_CACHE_FILE.name}.{os.getpid()}.tmp")
+    try:
+        PARSE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(
+            json.dumps({"version": version, "entries": entries}), encoding="utf-8"
+        )
+        os.replace(tmp, PARSE_CACHE_FILE)
+    except Exception:
+        # non-fatal: next run just parses again
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _parse_file_safe(p: Path) -> Tuple[Optional[ParsedFile], Optional[str]]:
+    # Worker entry point: report failures as text so one bad file neither
+    # aborts the batch nor depends on the exception being picklable
+    try:
+        return parse_file(p), None
+    except Exception as e:
+        return None, str(e)
+
+
+def parse_files(
+    files: List[Path], jobs: int
+) -> Dict[Path, Tuple[Optional[ParsedFile], Optional[str]]]:
+    """Parse ``files`` across ``jobs`` worker processes.
+
+    Returns an empty mapping when the batch is too small to be worth a pool;
+    ``ingest_file`` then parses each file itself.
+    """
+    if jobs <= 1 or len(files) < PARALLEL_MIN_FILES:
+        return {}
+    print(f"[INFO] Parsing {len(files)} files with {jobs} workers...", flush=True)
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        results = ex.map(_parse_file_safe, files, chunksize=16)
+        return dict(zip(files, results))
+
+
 def ingest_file(
     p: Path,
+    parsed: Optional[ParsedFile] = None,
 ) -> tuple[
     PBFile, list[str], dict[str, int], dict[str, int], dict[str, str], dict[str, str]
 ]:
-    lines = read_file_lines(p)
-    meta, projects, votes, _vip, _sip = parse_pb_lines(lines)
-    tile = parse_pb_to_tile(p)
+    meta, tile = parsed if parsed is not None else parse_file(p)
 
     webpage_name, country, unit, instance, subunit = compute_webpage_name(meta)
     group_key = build_group_key(country, unit, instance, subunit)
@@ -210,7 +313,7 @@ def ingest_file(
             subunit,
         ),
     )
-    comments = _parse_comments_from_meta(meta)
+    comments = parse_comments_from_meta(meta)
     # Extract per-file category/beneficiaries token counts from tile (computed in parse_pb_to_tile)
     cat_counts: dict[str, int] = tile.get("categories_counts") or {}
     beneficiaries_counts: dict[str, int] = tile.get("beneficiaries_counts") or {}
@@ -240,12 +343,17 @@ def mark_group_current(s, group_key: str) -> None:
         it.is_current = it.id == latest_id
 
 
-def refresh(full: bool = False) -> Dict[str, Any]:
+def refresh(
+    full: bool = False, jobs: Optional[int] = None, use_parse_cache: bool = True
+) -> Dict[str, Any]:
     # Align retries with entrypoint.sh envs for consistency
     max_tries = int(os.environ.get("WAIT_FOR_DB_MAX_TRIES", "60"))
     sleep_secs = float(os.environ.get("WAIT_FOR_DB_SLEEP", "2"))
     ensure_db(max_tries=max_tries, sleep_secs=sleep_secs)
-    files = collect_files()
+    # Stat every file once; the mtime filter and parse-cache lookup share it
+    scanned = scan_files()
+    files = [p for p, _st in scanned]
+    stats = dict(scanned)
     now = datetime.utcnow()
     last = None if full else load_last_refresh()
     processed = 0
@@ -263,16 +371,82 @@ def refresh(full: bool = False) -> Dict[str, Any]:
     else:
         print("[INFO] Full refresh (processing all files).", flush=True)
 
+    # mtime filter, evaluated once per file
+    unchanged: set[Path] = set()
+    if last:
+        for p in files:
+            if datetime.fromtimestamp(int(stats[p].st_mtime)) <= last:
+                unchanged.add(p)
+
+    # Reuse parses of files unchanged since they were last parsed; only the
+    # rest go through the parser
+    cache_version = parse_cache_version()
+    prev_cache = load_parse_cache(cache_version) if use_parse_cache else {}
+    parse_cache: Dict[str, Any] = {}
+    sigs: Dict[Path, List[int]] = {}
+    parsed_files: Dict[Path, Tuple[Optional[ParsedFile], Optional[str]]] = {}
+    rehashed = 0
+    for p in files:
+        sigs[p] = _file_sig(stats[p])
+        entry = prev_cache.get(str(p))
+        if not entry:
+            continue
+        if entry.get("sig") != sigs[p]:
+            # Same size but new mtime: compare contents before re-parsing
+            if not entry.get("sha1") or (entry.get("sig") or [])[1:] != sigs[p][1:]:
+                continue
+            try:
+                if _file_sha1(p) != entry["sha1"]:
+                    continue
+            except OSError:
+                continue
+            entry = {**entry, "sig": sigs[p]}
+            rehashed += 1
+        # Keep entries for skipped files so later runs still benefit
+        parse_cache[str(p)] = entry
+        if p not in unchanged:
+            parsed_files[p] = ((entry["meta"], entry["tile"]), None)
+    if parsed_files:
+        print(f"[INFO] Reusing cached parse for {len(parsed_files)} files.", flush=True)
+    if rehashed:
+        print(
+            f"[INFO] {rehashed} files had a new mtime but unchanged contents.",
+            flush=True,
+        )
+
+    # Parsing is CPU-bound and independent per file: do it up front on a
+    # process pool, then write to the DB sequentially below
+    parsed_files.update(
+        parse_files(
+            [p for p in files if p not in unchanged and p not in parsed_files],
+            jobs if jobs is not None else (os.cpu_count() or 1),
+        )
+    )
+
     with get_session() as s:
         for idx, p in enumerate(files, start=1):
-            st = p.stat()
-            file_mtime = datetime.fromtimestamp(int(st.st_mtime))
-            if last and file_mtime <= last:
+            if p in unchanged:
                 skipped += 1
                 print(f"[SKIP] {idx}/{total} {p.name} (unchanged)", flush=True)
                 continue
             try:
                 print(f"[LOAD] {idx}/{total} {p.name}", flush=True)
+                parsed, parse_error = parsed_files.get(p, (None, None))
+                if parse_error is not None:
+                    raise RuntimeError(parse_error)
+                if parsed is None:
+                    parsed = parse_file(p)
+                cached = parse_cache.get(str(p))
+                parse_cache[str(p)] = {
+                    "sig": sigs[p],
+                    "sha1": (
+                        cached["sha1"]
+                        if cached and cached.get("sha1")
+                        else _file_sha1(p)
+                    ),
+                    "meta": parsed[0],
+                    "tile": parsed[1],
+                }
                 (
                     rec,
                     comments,
@@ -280,9 +454,7 @@ def refresh(full: bool = False) -> Dict[str, Any]:
                     beneficiaries_counts,
                     cat_disp,
                     beneficiaries_display,
-                ) = ingest_file(
-                    p
-                )
+                ) = ingest_file(p, parsed)
                 # Link supersedes when same group exists current
                 prev: PBFile | None = (
                     s.query(PBFile)
@@ -412,6 +584,7 @@ def refresh(full: bool = False) -> Dict[str, Any]:
             )
 
     save_refresh_timestamp("pb", now)
+    save_parse_cache(parse_cache, cache_version)
 
     # Invalidate in-process caches so admin/public pages reflect latest immediately
     try:
@@ -444,8 +617,21 @@ def main() -> None:
         action="store_true",
         help="Process all files, ignore last refresh time",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for parsing files (default: CPU count; 1 disables)",
+    )
+    parser.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        help="Re-parse every processed file instead of reusing cached parses",
+    )
     args = parser.parse_args()
-    result = refresh(full=args.full)
+    result = refresh(
+        full=args.full, jobs=args.jobs, use_parse_cache=not args.no_parse_cache
+    )
     print(json.dumps(result, indent=2))
 
 
@@ -0,0 +1,99 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from app.utils import zip_utils
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    # Small limits so one member takes the streamed (large-file) path
+    monkeypatch.setattr(zip_utils, "INLINE_MAX_BYTES", 4096)
+    monkeypatch.setattr(zip_utils, "STREAM_CHUNK_BYTES", 1000)
+    monkeypatch.setattr(zip_utils, "DEFLATE_CACHE_DIR", tmp_path / "deflate")
+    src = tmp_path / "src"
+    src.mkdir()
+    contents = {
+        "a.pb": b"META\nkey;value\ndescription;small file\n" * 10,
+        "empty.pb": b"",
+        "big.pb": os.urandom(3000) + b"PROJECTS\n" * 2000,
+    }
+    for name, data in contents.items():
+        (src / name).write_bytes(data)
+    return [(name, src / name) for name in contents], contents
+
+
+def _check(archive: bytes, expected):
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == list(expected)
+        for name, data in expected.items():
+            assert zf.read(name) == data
+
+
+@pytest.mark.parametrize("direct_append", [True, False])
+@pytest.mark.parametrize("compress_type", [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED])
+def test_write_files_round_trip(sources, monkeypatch, tmp_path, direct_append, compress_type):
+    pairs, contents = sources
+    monkeypatch.setattr(
+        zip_utils, "_DIRECT_APPEND", direct_append and zip_utils._DIRECT_APPEND
+    )
+    out = tmp_path / "out.zip"
+    added = []
+    # Twice, so the second deflated build is served from the blob cache
+    for _ in range(2):
+        added.clear()
+        with zipfile.ZipFile(out, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zip_utils.write_files(
+                zf,
+                pairs,
+                on_added=lambda idx, name: added.append((idx, name)),
+                compress_type=compress_type,
+            )
+        _check(out.read_bytes(), contents)
+        assert added == [(i, name) for i, (name, _p) in enumerate(pairs, start=1)]
+    with zipfile.ZipFile(out) as zf:
+        assert {i.compress_type for i in zf.infolist()} == {compress_type}
+
+
+@pytest.mark.parametrize("direct_append", [True, False])
+@pytest.mark.parametrize("compress_type", [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED])
+def test_iter_zip_round_trip(sources, monkeypatch, direct_append, compress_type):
+    pairs, contents = sources
+    monkeypatch.setattr(
+        zip_utils, "_DIRECT_APPEND", direct_append and zip_utils._DIRECT_APPEND
+    )
+    chunks = list(
+        zip_utils.iter_zip(
+            pairs,
+            extra_members=[("_NOTE.txt", b"note")],
+            compress_type=compress_type,
+        )
+    )
+    # The large member is handed out in several pieces
+    assert len(chunks) > len(pairs) + 1
+    _check(b"".join(chunks), {**contents, "_NOTE.txt": b"note"})
+
+
+def test_zipfile_internals_present():
+    # Fails loudly on a Python release that changes what _write_deflated uses
+    assert zip_utils._DIRECT_APPEND
+
+
+def test_prune_deflate_cache(sources):
+    pairs, _contents = sources
+    paths = dict(pairs)
+    with zipfile.ZipFile(io.BytesIO(), mode="w") as zf:
+        zip_utils.write_files(zf, pairs)
+    cache_dir = zip_utils.DEFLATE_CACHE_DIR
+    # Blobs for the two inline members; the large one is never cached
+    assert len(list(cache_dir.glob("*.bin"))) == 2
+    assert zip_utils.prune_deflate_cache() == 0
+
+    paths["a.pb"].unlink()
+    paths["empty.pb"].write_bytes(b"changed")
+    (cache_dir / "junk.bin").write_bytes(b"x")
+    assert zip_utils.prune_deflate_cache() == 3
+    assert not list(cache_dir.glob("*.bin"))